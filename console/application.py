@@ -16,6 +16,9 @@ from command.list_command import ListCommand
 from helper.helper_set import HelperSet
 from helper.formatter_helper import FormatterHelper
 from helper.dialog_helper import DialogHelper
+from formatter.display_width import DisplayWidth
+from formatter.output_formatter import OutputFormatter
+from terminal import Terminal
 
 
 class Application(object):
@@ -83,6 +86,9 @@ class Application(object):
 
             status_code = e.errno if hasattr(e, 'errno') else 1
 
+        # buffering outputs must not lose their messages on exit
+        output_.flush()
+
         if self.__auto_exit:
             if status_code > 255:
                 status_code = 255
@@ -122,7 +128,11 @@ class Application(object):
 
         if input_.has_parameter_option(['--quiet', '-q']):
             output_.set_verbosity(Output.VERBOSITY_QUIET)
-        elif input_.has_parameter_option(['--verbose', '-v']):
+        elif input_.has_parameter_option(['-vvv', '--verbose=3']):
+            output_.set_verbosity(Output.VERBOSITY_DEBUG)
+        elif input_.has_parameter_option(['-vv', '--verbose=2']):
+            output_.set_verbosity(Output.VERBOSITY_VERY_VERBOSE)
+        elif input_.has_parameter_option(['--verbose', '-v', '--verbose=1']):
             output_.set_verbosity(Output.VERBOSITY_VERBOSE)
 
         if not name:
@@ -160,8 +170,8 @@ class Application(object):
         ]
 
         for option in self.get_definition().get_options():
-            messages.append('  %-29s %s %s'
-                            % ('<info>--' + option.get_name() + '</info>',
+            messages.append('  <info>%s</info> %s %s'
+                            % (DisplayWidth.pad('--' + option.get_name(), 16),
                                '<info>-' + option.get_shortcut() + '</info>' if option.get_shortcut() else '  ',
                                option.get_description()))
 
@@ -377,14 +387,14 @@ class Application(object):
 
         width = 0
         for command in commands.values():
-            width = len(command.get_name()) if len(command.get_name()) > width else width
+            width = max(width, DisplayWidth.get_width(command.get_name()))
         width += 2
 
         if raw:
             messages = []
             for space, commands in self.sort_commands(commands):
                 for name, command in commands:
-                    messages.append('%-*s %s' % (width, name, command.get_description()))
+                    messages.append('%s %s' % (DisplayWidth.pad(name, width), command.get_description()))
 
                 return '\n'.join(messages)
 
@@ -394,18 +404,25 @@ class Application(object):
         else:
             messages.append('<comment>Available commands:</comment>')
 
+        # descriptions are wrapped to the terminal, next to the names
+        indent = width + 3
+        columns = max(1, Terminal.get_columns() - indent)
+        formatter = OutputFormatter()
+
         # add command by namespace
         for space, commands in self.sort_commands(commands):
             if not namespace and '_global' != space:
                 messages.append('  <comment>' + space + '</comment>')
 
             for name, command in commands:
-                messages.append('  <info>' + '%-*s</info> %s' % (width, name, command.get_description()))
+                description = DisplayWidth.wrap(command.get_description(), columns, formatter)
+                messages.append('  <info>%s</info> %s' % (DisplayWidth.pad(name, width),
+                                                          ('\n' + ' ' * indent).join(description)))
 
         return '\n'.join(messages)
 
     def render_exception(self, e, output_):
-        if output_.get_verbosity() == Output.VERBOSITY_VERBOSE:
+        if output_.is_verbose():
             error = traceback.format_exc()
         else:
             error = str(e)
@@ -423,7 +440,7 @@ class Application(object):
 
             InputOption('--help', '-h', InputOption.VALUE_NONE, 'Display this help message.'),
             InputOption('--quiet', '-q', InputOption.VALUE_NONE, 'Do not output any message.'),
-            InputOption('--verbose', '-v', InputOption.VALUE_NONE, 'Increase verbosity of messages.'),
+            InputOption('--verbose', '-v', InputOption.VALUE_NONE, 'Increase the verbosity of messages: 1 for normal output, 2 for more verbose output and 3 for debug.'),
             InputOption('--version', '-V', InputOption.VALUE_NONE, 'Display this application version.'),
             InputOption('--ansi', '', InputOption.VALUE_NONE, 'Force ANSI output.'),
             InputOption('--no-ansi', '', InputOption.VALUE_NONE, 'Disable ANSI output.'),
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+
+import re
+import unicodedata
+from bisect import bisect_right
+
+from lru_cache import LRUCache
+from ..terminal import Terminal
+
+
+class DisplayWidth(object):
+    """
+    Measures the width of texts once displayed in a terminal.
+
+    Escape sequences take no room, East Asian wide and fullwidth
+    characters take two columns and combining characters none.
+
+    Usage:
+    >>> DisplayWidth.get_width(u'日本語')
+    6
+    >>> DisplayWidth.pad('<info>foo</info>', 5, formatter)
+    '<info>foo</info>  '
+    """
+
+    ANSI_PATTERN = re.compile('\033\\[[0-9;?]*[A-Za-z]')
+
+    # East Asian wide (W) and fullwidth (F) ranges
+    WIDE_RANGES = (
+        (0x1100, 0x115f),   # Hangul Jamo initial consonants
+        (0x2329, 0x232a),   # angle brackets
+        (0x2e80, 0x303e),   # CJK radicals ... CJK symbols and punctuation
+        (0x3041, 0x33ff),   # Hiragana ... CJK compatibility
+        (0x3400, 0x4dbf),   # CJK unified ideographs extension A
+        (0x4e00, 0x9fff),   # CJK unified ideographs
+        (0xa000, 0xa4cf),   # Yi syllables and radicals
+        (0xa960, 0xa97f),   # Hangul Jamo extended A
+        (0xac00, 0xd7a3),   # Hangul syllables
+        (0xf900, 0xfaff),   # CJK compatibility ideographs
+        (0xfe10, 0xfe19),   # vertical forms
+        (0xfe30, 0xfe6f),   # CJK compatibility forms and small form variants
+        (0xff00, 0xff60),   # fullwidth forms
+        (0xffe0, 0xffe6),   # fullwidth signs
+        (0x1f300, 0x1f64f), # miscellaneous symbols and pictographs, emoticons
+        (0x1f900, 0x1f9ff), # supplemental symbols and pictographs
+        (0x20000, 0x2fffd), # CJK unified ideographs extensions B ...
+        (0x30000, 0x3fffd)
+    )
+
+    WIDE_STARTS = tuple([start for start, end in WIDE_RANGES])
+
+    ZERO_WIDTH_CATEGORIES = ('Mn', 'Me', 'Cf')
+
+    __widths = LRUCache(4096)
+    __char_widths = {}
+
+    @classmethod
+    def get_width(cls, text, formatter=None):
+        """
+        Returns the number of columns taken by a text.
+
+        @param text: The text to measure
+        @type text: str or unicode
+        @param formatter: A formatter to remove the style tags of the text with
+        @type formatter: OutputFormatter or None
+
+        @rtype: int
+        """
+        if formatter is not None:
+            text = formatter.strip(text)
+
+        width = cls.__widths.get(text)
+        if width is None:
+            width = cls.measure(text)
+            cls.__widths.set(text, width)
+
+        return width
+
+    @classmethod
+    def measure(cls, text):
+        if '\033' in text:
+            text = cls.ANSI_PATTERN.sub('', text)
+
+        if isinstance(text, str):
+            try:
+                text.decode('ascii')
+
+                return len(text)
+            except UnicodeDecodeError:
+                text = text.decode('utf-8', 'replace')
+        else:
+            try:
+                text.encode('ascii')
+
+                return len(text)
+            except UnicodeEncodeError:
+                pass
+
+        get_char_width = cls.get_char_width
+
+        return sum([get_char_width(char) for char in text])
+
+    @classmethod
+    def get_char_width(cls, char):
+        """
+        Returns the number of columns taken by a unicode character.
+
+        @type char: unicode
+
+        @rtype: int
+        """
+        width = cls.__char_widths.get(char)
+        if width is None:
+            width = 1
+            if len(char) == 1:
+                code = ord(char)
+            else:
+                # surrogate pair of a narrow build
+                code = 0x10000 + ((ord(char[0]) - 0xd800) << 10) + (ord(char[1]) - 0xdc00)
+
+            if unicodedata.category(char[0]) in cls.ZERO_WIDTH_CATEGORIES and code != 0x00ad:
+                width = 0
+            elif 0x1160 <= code <= 0x11ff or code == 0x200b:
+                # Hangul medial vowels and final consonants, zero width space
+                width = 0
+            else:
+                index = bisect_right(cls.WIDE_STARTS, code) - 1
+                if index >= 0 and code <= cls.WIDE_RANGES[index][1]:
+                    width = 2
+
+            cls.__char_widths[char] = width
+
+        return width
+
+    @classmethod
+    def pad(cls, text, width, formatter=None):
+        """
+        Pads a text with spaces on the right up to the given width.
+
+        @param text: The text to pad
+        @type text: str or unicode
+        @param width: The width to reach
+        @type width: int
+        @param formatter: A formatter to remove the style tags of the text with
+        @type formatter: OutputFormatter or None
+
+        @rtype: str or unicode
+        """
+        return text + ' ' * max(0, width - cls.get_width(text, formatter))
+
+    @classmethod
+    def wrap(cls, text, width=None, formatter=None):
+        """
+        Wraps a text on word boundaries so that
+        no line is wider than the given width.
+
+        Words wider than the width are split.
+        Existing line breaks are kept.
+        Escape sequences, and the style tags known by the formatter
+        when one is given, take no room and are never split.
+        With a formatter, the tags still opened at the end of a line
+        are closed there and opened again on the next line, so that
+        every line can be formatted on its own.
+
+        @param text: The text to wrap
+        @type text: str or unicode
+        @param width: The maximum width of the lines (defaults to the width of the terminal)
+        @type width: int
+        @param formatter: A formatter to recognize the style tags of the text with
+        @type formatter: OutputFormatter or None
+
+        @return: The lines of the text
+        @rtype: list
+        """
+        if width is None:
+            width = Terminal.get_columns()
+
+        if width < 1:
+            raise ValueError('The width must be positive (%s given)' % width)
+
+        get_width = cls.get_width
+        lines = []
+        for paragraph in text.split('\n'):
+            if get_width(paragraph, formatter) <= width:
+                lines.append(paragraph)
+                continue
+
+            line, line_width = [], 0
+            for word in paragraph.split(' '):
+                word_width = get_width(word, formatter)
+
+                if line and line_width + 1 + word_width > width:
+                    lines.append(' '.join(line))
+                    line, line_width = [], 0
+
+                while word_width > width:
+                    head, word = cls.split(word, width, formatter)
+                    lines.append(head)
+                    word_width = get_width(word, formatter)
+
+                line.append(word)
+                line_width += word_width + (1 if len(line) > 1 else 0)
+
+            lines.append(' '.join(line))
+
+        if formatter is not None and '<' in text:
+            lines = cls.close_tags(lines, formatter)
+
+        return lines
+
+    @classmethod
+    def split(cls, word, width, formatter=None):
+        """
+        Splits a word after the given number of columns.
+
+        Escape sequences and style tags are kept whole,
+        at the end of the first part.
+
+        @rtype: tuple
+        """
+        is_bytes = isinstance(word, str)
+        chars = word.decode('utf-8', 'replace') if is_bytes else word
+
+        columns = 0
+        index = 0
+        length = len(chars)
+        while index < length:
+            end = cls.match_markup(chars, index, formatter)
+            if end is not None:
+                index = end
+                continue
+
+            char_width = cls.get_char_width(chars[index])
+            # always make some progress
+            if columns and columns + char_width > width:
+                break
+
+            columns += char_width
+            index += 1
+
+        head, tail = chars[:index], chars[index:]
+        if is_bytes:
+            return head.encode('utf-8'), tail.encode('utf-8')
+
+        return head, tail
+
+    @classmethod
+    def match_markup(cls, text, index, formatter=None):
+        """
+        Returns the end of the escape sequence, style tag or escaping
+        backslash starting at the given index, if any.
+
+        @rtype: int or None
+        """
+        char = text[index]
+        if char == '\033':
+            match = cls.ANSI_PATTERN.match(text, index)
+            if match is not None:
+                return match.end()
+        elif formatter is None:
+            return None
+        elif char == '\\':
+            if text[index + 1:index + 2] == '<':
+                # only the escaped "<" is displayed
+                return index + 1
+        elif char == '<' and (index == 0 or text[index - 1] != '\\'):
+            match = formatter.TAG_PATTERN.match(text, index)
+            if match is not None and not formatter.strip(match.group(0)):
+                return match.end()
+
+        return None
+
+    @classmethod
+    def close_tags(cls, lines, formatter):
+        """
+        Closes the style tags still opened at the end of each line
+        and opens them again at the start of the next one.
+
+        @rtype: list
+        """
+        opened = []
+        wrapped = []
+        for line in lines:
+            prefix = ''.join(opened)
+
+            index = line.find('<')
+            while index != -1:
+                end = cls.match_markup(line, index, formatter)
+                if end is None:
+                    index = line.find('<', index + 1)
+                else:
+                    tag = line[index:end]
+                    if tag[1] != '/':
+                        opened.append(tag)
+                    elif tag == '</>':
+                        opened = opened[:-1]
+                    else:
+                        # the closing tag closes the tags opened after its opening tag
+                        name = '<%s' % tag[2:].lower()
+                        for position in range(len(opened) - 1, -1, -1):
+                            if opened[position].lower() == name:
+                                del opened[position:]
+                                break
+
+                    index = line.find('<', end)
+
+            wrapped.append(prefix + line + '</>' * len(opened))
+
+        return wrapped
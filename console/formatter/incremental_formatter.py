@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import re
+
+from output_formatter import OutputFormatter
+from output_formatter_style_stack import OutputFormatterStyleStack
+
+
+class IncrementalFormatter(object):
+    """
+    IncrementalFormatter formats a text given chunk by chunk.
+
+    The parse state and the style stack are kept between chunks,
+    so tags can be opened in a chunk and closed in another one.
+    The formatted text of a chunk is returned right away, except
+    for a trailing incomplete tag which is kept until the next chunk.
+
+    Usage:
+    >>> incremental = IncrementalFormatter(formatter)
+    >>> incremental.format('<info>foo</in')
+    '\\033[32mfoo\\033[0m'
+    >>> incremental.format('fo>bar')
+    'bar'
+    >>> incremental.flush()
+    ''
+    """
+
+    # the end of a chunk that may be the start of a tag
+    PENDING_PATTERN = re.compile('\\\\?<(/?)([a-z][a-z0-9_=;#,-]*)?$|\\\\$', re.I)
+
+    # incomplete tags longer than this are not waited for
+    MAX_PENDING_LENGTH = 256
+
+    def __init__(self, formatter):
+        """
+        Constructor
+
+        @param formatter: The formatter to parse and render the chunks with
+        @type formatter: OutputFormatter
+        """
+        self.formatter = formatter
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets the opened tags and the pending text.
+        """
+        self.__stack = OutputFormatterStyleStack()
+        self.__mode = OutputFormatter.TEXT
+        self.__pending = ''
+
+    def get_formatter(self):
+        return self.formatter
+
+    def format(self, chunk):
+        """
+        Formats the next chunk of the text.
+
+        Each formatted chunk ends with the terminal
+        in its default state.
+
+        @param chunk: The next chunk of the text
+        @type chunk: str
+
+        @rtype: str
+        """
+        text = self.__pending + chunk
+
+        cut = len(text)
+        start = cut - 1
+        pos = text.rfind('<', max(0, cut - self.MAX_PENDING_LENGTH))
+        if pos != -1:
+            start = pos - 1
+
+        match = self.PENDING_PATTERN.search(text, max(0, start))
+        if match is not None:
+            cut = match.start()
+
+        self.__pending = text[cut:]
+
+        return self.process(text[:cut])
+
+    def flush(self):
+        """
+        Formats the pending text, incomplete tags being formatted as is.
+
+        The opened tags stay opened.
+
+        @rtype: str
+        """
+        text = self.__pending
+        self.__pending = ''
+
+        return self.process(text)
+
+    def process(self, text):
+        if not text:
+            return ''
+
+        formatter = self.formatter
+
+        ops = []
+        self.__mode = formatter.scan(text, ops, self.__mode)
+
+        return formatter.render(formatter.execute(ops, self.__stack))
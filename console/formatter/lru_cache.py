@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from ordereddict import OrderedDict
+
+
+class LRUCache(object):
+    """
+    A bounded, thread-safe mapping evicting the least recently used items.
+
+    Usage:
+    >>> cache = LRUCache(2)
+    >>> cache.set('foo', 1)
+    >>> cache.get('foo')
+    1
+    """
+
+    def __init__(self, max_size=1024):
+        """
+        Constructor
+
+        @param max_size: The maximum number of items (0 disables the cache)
+        @type max_size: int
+        """
+        self.max_size = max(0, int(max_size))
+        self.hits = 0
+        self.misses = 0
+
+        self.__items = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.__lock:
+            try:
+                value = self.__items.pop(key)
+            except KeyError:
+                self.misses += 1
+
+                return default
+
+            self.__items[key] = value
+            self.hits += 1
+
+            return value
+
+    def set(self, key, value):
+        if not self.max_size:
+            return
+
+        with self.__lock:
+            self.__items.pop(key, None)
+            self.__items[key] = value
+
+            if len(self.__items) > self.max_size:
+                self.__items.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__items.clear()
+
+    def get_info(self):
+        """
+        Returns the cache statistics.
+
+        @return: A dict with the hits, misses, hit_rate, size and max_size keys
+        @rtype: dict
+        """
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': float(self.hits) / lookups if lookups else 0.0,
+            'size': len(self.__items),
+            'max_size': self.max_size
+        }
+
+    def __len__(self):
+        return len(self.__items)
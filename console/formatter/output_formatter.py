@@ -4,14 +4,27 @@ import re
 
 from output_formatter_style import OutputFormatterStyle
 from output_formatter_style_stack import OutputFormatterStyleStack
+from lru_cache import LRUCache
 
 
 class OutputFormatter(object):
 
-    FORMAT_PATTERN = '(?is)(\\\\?)<(/?)([a-z][a-z0-9_=;-]+)?>((?:(?!\\\\?<).)*)'
+    TAG_PATTERN = re.compile('<(/?)([a-z][a-z0-9_=;#,-]+)?>', re.I)
 
-    def __init__(self, decorated=False, styles=None):
+    # compiled program operations
+    TEXT = 0
+    STYLED_TEXT = 1
+    PUSH = 2
+    POP = 3
+
+    # longer messages are compiled but not cached
+    CACHE_MAX_MESSAGE_LENGTH = 4096
+
+    def __init__(self, decorated=False, styles=None, cache_size=1024):
         self.__decorated = bool(decorated)
+        self.__cache = LRUCache(cache_size)
+        self.__revision = OutputFormatterStyle.revision
+        self.__inline_styles = LRUCache(256)
 
         styles = styles or {}
 
@@ -24,11 +37,33 @@ class OutputFormatter(object):
         for name, style in styles.items():
             self.set_style(name, style)
 
-        self.__style_stack = OutputFormatterStyleStack()
-
     @classmethod
     def escape(cls, text):
-        return re.sub('(?i)([^\\\\]?)<', '$1\\<', text)
+        """
+        Escapes the "<" characters of a text so that they are not taken for tags.
+
+        @param text: A text or a list of texts
+        @type text: str or list
+
+        @return: The escaped text or list of texts
+        @rtype: str or list
+        """
+        if isinstance(text, (list, tuple)):
+            return [t.replace('<', '\\<') for t in text]
+
+        return text.replace('<', '\\<')
+
+    @classmethod
+    def unescape(cls, text):
+        """
+        Turns escaped "\\<" sequences back into "<" characters.
+
+        @param text: A text
+        @type text: str
+
+        @rtype: str
+        """
+        return text.replace('\\<', '<')
 
     def set_decorated(self, decorated):
         self.__decorated = bool(decorated)
@@ -38,6 +73,7 @@ class OutputFormatter(object):
 
     def set_style(self, name, style):
         self.__styles[name] = style
+        self.__cache.clear()
 
     def has_style(self, name):
         return name in self.__styles
@@ -47,61 +83,343 @@ class OutputFormatter(object):
             return self.__styles[name]
 
     def format(self, message):
-        message = re.sub(self.__class__.FORMAT_PATTERN, self.replace_style, message)
+        """
+        Formats a message.
+
+        Every message is formatted with its own style stack, so the styles
+        of a message never leak into the next one and formatting
+        is safe to use from several threads.
+
+        @param message: The message to format
+        @type message: str
+
+        @rtype: str
+        """
+        return self.get_program(message, self.__decorated)[1]
+
+    def format_many(self, messages):
+        """
+        Formats several messages in one go.
+
+        @param messages: A list or an iterator of messages
+        @type messages: list or iterator
+
+        @return: A list of formatted messages, or a generator
+                 if an iterator was given
+        @rtype: list or generator
+        """
+        decorated = self.__decorated
+        get_program = self.get_program
+
+        if isinstance(messages, (list, tuple)):
+            return [get_program(message, decorated)[1] for message in messages]
+
+        return (get_program(message, decorated)[1] for message in messages)
+
+    def strip(self, message):
+        """
+        Removes the style tags of a message and unescapes it.
+
+        This gives the same result as formatting the message undecorated
+        but does not check the nesting of the tags.
+
+        @param message: The message to strip
+        @type message: str
+
+        @rtype: str
+        """
+        if '<' not in message:
+            return message
+
+        styles = self.__styles
+        parts = []
+        offset = 0
+        for match in self.TAG_PATTERN.finditer(message):
+            start = match.start()
+            if start > 0 and message[start - 1] == '\\':
+                # escaped tag, kept as is
+                continue
+
+            name = match.group(2)
+            if name is None:
+                if match.group(1) != '/':
+                    # "<>" is not a tag
+                    continue
+            elif name.lower() not in styles \
+                    and ('=' not in name or self.create_style_from_string(name) is False):
+                # unknown tag
+                continue
+
+            parts.append(message[offset:start])
+            offset = match.end()
+
+        parts.append(message[offset:])
+
+        return ''.join(parts).replace('\\<', '<')
+
+    def parse(self, message):
+        """
+        Parses the style tags of a message.
+
+        The result can be rendered several times, decorated or not,
+        without parsing the message again.
+
+        @param message: The message to parse
+        @type message: str
+
+        @return: A list of (style, text) segments, style being None for unstyled text
+        @rtype: list
+        """
+        return self.execute(self.get_program(message, True)[0])
+
+    def get_program(self, message, decorated):
+        """
+        Returns the compiled program of a message from the cache,
+        compiling it if needed.
+
+        @rtype: tuple
+        """
+        if len(message) > self.CACHE_MAX_MESSAGE_LENGTH:
+            return self.compile(message, decorated)
+
+        if self.__revision != OutputFormatterStyle.revision:
+            # a style has changed since the messages were rendered
+            self.__cache.clear()
+            self.__revision = OutputFormatterStyle.revision
+
+        key = (message, decorated)
+        program = self.__cache.get(key)
+        if program is None:
+            program = self.compile(message, decorated)
+            self.__cache.set(key, program)
+
+        return program
+
+    def get_cache_info(self):
+        """
+        Returns the statistics of the compiled programs cache.
+
+        @rtype: dict
+        """
+        return self.__cache.get_info()
+
+    def compile(self, message, decorated=True):
+        """
+        Compiles a message into a program of literal texts
+        and style stack operations, along with its rendered text.
+
+        @param message: The message to compile
+        @type message: str
+        @param decorated: Whether the program will be used to decorate the message
+        @type decorated: bool
+
+        @return: A tuple of operations and the rendered text
+        @rtype: tuple
+
+        @raise ValueError: When the style tags are incorrectly nested
+        """
+        ops = []
+        if '<' not in message:
+            # fast path: nothing to parse
+            if message:
+                ops.append((self.TEXT, message))
+        else:
+            self.scan(message, ops)
+
+        ops = tuple(ops)
+
+        return ops, self.render(self.execute(ops), decorated)
+
+    def scan(self, message, ops, mode=TEXT):
+        """
+        Scans a message for style tags in a single pass
+        and appends the corresponding operations.
+
+        The text following a tag is styled up to the next "<".
+        If that "<" does not start a valid tag, the text is left
+        unstyled up to the next valid tag.
+        A "\\<" sequence is an escaped "<".
+
+        @param message: The message to scan
+        @type message: str
+        @param ops: The list of operations to append to
+        @type ops: list
+        @param mode: The mode of the text at the start of the message
+        @type mode: int
+
+        @return: The mode of the text at the end of the message
+        @rtype: int
+        """
+        TEXT, STYLED_TEXT = self.TEXT, self.STYLED_TEXT
+        match_tag, search_tag = self.TAG_PATTERN.match, self.TAG_PATTERN.search
+        append_text = self.append_text
+        styles = self.__styles
+
+        start = 0
+        pos = message.find('<')
+        while pos != -1:
+            match = match_tag(message, pos)
+
+            if match is None:
+                if mode == STYLED_TEXT:
+                    end = pos - 1 if pos > 0 and message[pos - 1] == '\\' else pos
+                    append_text(ops, mode, message[start:end])
+                    start = end
+                    mode = TEXT
+
+                # skip to the next valid tag
+                match = search_tag(message, pos + 1)
+                if match is None:
+                    break
+
+                pos = match.start()
+
+            escaped = pos > 0 and message[pos - 1] == '\\'
+            end = pos - 1 if escaped else pos
+
+            append_text(ops, mode, message[start:end])
+            mode = STYLED_TEXT
+            start = match.end()
+
+            if escaped:
+                # we got "\<" escaped char
+                start = pos
+            elif not match.group(2):
+                if match.group(1) == '/':
+                    # we got "</>" tag
+                    ops.append((self.POP, None))
+                else:
+                    # we got "<>" tag
+                    ops.append((TEXT, '<>'))
+            else:
+                name = match.group(2).lower()
+                if name in styles:
+                    style = styles[name]
+                elif '=' in name:
+                    style = self.create_style_from_string(match.group(2))
+                else:
+                    style = False
+
+                if style is False:
+                    # unknown tag, kept as is
+                    start = pos
+                else:
+                    ops.append((self.POP if match.group(1) == '/' else self.PUSH, style))
+
+            pos = message.find('<', match.end())
+
+        append_text(ops, mode, message[start:])
+
+        return mode
+
+    def append_text(self, ops, mode, text):
+        if text:
+            ops.append((mode, text.replace('\\<', '<') if mode == self.TEXT else text))
+
+    def execute(self, ops, stack=None):
+        """
+        Runs the operations of a compiled program against a style stack.
+
+        @param ops: The operations of a compiled program
+        @type ops: tuple
+        @param stack: The style stack (defaults to a new one)
+        @type stack: OutputFormatterStyleStack
+
+        @return: A list of (style, text) segments
+        @rtype: list
+        """
+        if stack is None:
+            stack = OutputFormatterStyleStack()
+
+        segments = []
+        for op, arg in ops:
+            if op == self.STYLED_TEXT:
+                segments.append((stack.get_current(), arg))
+            elif op == self.TEXT:
+                segments.append((None, arg))
+            elif op == self.PUSH:
+                stack.push(arg)
+            else:
+                stack.pop(arg)
 
-        return message.replace('\\<', '<')
+        return segments
 
-    def replace_style(self, match):
-        # we got "\<" escaped char
-        if match.group(1) == '\\':
-            return self.apply_current_style(match.group(0))
+    def render(self, segments, decorated=None):
+        """
+        Renders parsed segments.
 
-        if match.group(3) == '':
-            if match.group(2) == '/':
-                # we got "</>" tag
-                self.__style_stack.pop()
+        @param segments: The segments returned by parse()
+        @type segments: list
+        @param decorated: Whether to decorate the text or not (defaults to the formatter's setting)
+        @type decorated: bool or None
 
-                return self.apply_current_style(match.group(4))
+        @rtype: str
+        """
+        if decorated is None:
+            decorated = self.__decorated
 
-            # we got "<>" tag
-            return '<>' + self.apply_current_style(match.group(4))
+        if not decorated:
+            return ''.join([text for style, text in segments])
 
-        if match.group(3).lower() in self.__styles:
-            style = self.__styles[match.group(3).lower()]
-        else:
-            style = self.create_style_from_string(match.group(3))
+        # only emit the escape sequences needed to switch
+        # from the current terminal state to the next one
+        get_transition = OutputFormatterStyle.get_transition
+        parts = []
+        current = None
+        for style, text in segments:
+            if not text:
+                continue
 
-            if style is False:
-                return self.apply_current_style(match.group(0))
+            state = style.get_state() if style is not None else None
+            if state != current:
+                parts.append(get_transition(current, state))
+                current = state
 
-        if match.group(2) == '/':
-            self.__style_stack.pop(style)
-        else:
-            self.__style_stack.push(style)
+            parts.append(text)
+
+        if current is not None:
+            parts.append('\033[0m')
 
-        return self.apply_current_style(match.group(4))
+        return ''.join(parts)
 
     def create_style_from_string(self, string):
-        matches = re.findall('([^=]+)=([^;]+)(;|$)', string.lower())
-        if not len(matches):
-            return False
+        """
+        Returns the style of an inline style tag, like "fg=red;bg=#ff8800;options=bold,underscore".
 
-        style = OutputFormatterStyle()
+        Parsed styles are cached by tag string.
 
-        for match in matches:
-            match.pop(0)
+        @param string: The content of the tag
+        @type string: str
 
-            if match.group(0) == 'fg':
-                style.set_foreground(match.group(1))
-            elif match.group(0) == 'bg':
-                style.set_background(match.group(1))
-            else:
-                pass
+        @return: The style or False if the string is not a valid inline style
+        @rtype: OutputFormatterStyle or bool
+        """
+        style = self.__inline_styles.get(string)
+        if style is None:
+            style = self.parse_inline_style(string)
+            self.__inline_styles.set(string, style)
 
         return style
 
-    def apply_current_style(self, text):
-        if self.is_decorated() and len(text):
-            return self.__style_stack.get_current().apply(text)
-        else:
-            return text
+    def parse_inline_style(self, string):
+        style = OutputFormatterStyle()
+
+        try:
+            for definition in string.lower().split(';'):
+                key, _, value = definition.partition('=')
+
+                if not value:
+                    return False
+                elif key == 'fg':
+                    style.set_foreground(value)
+                elif key == 'bg':
+                    style.set_background(value)
+                elif key == 'options':
+                    for option in value.split(','):
+                        style.set_option(option)
+                else:
+                    return False
+        except Exception:
+            return False
+
+        return style
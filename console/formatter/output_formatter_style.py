@@ -1,5 +1,48 @@
 # -*- coding: utf-8 -*-
 
+from lru_cache import LRUCache
+from ..terminal import Terminal
+
+
+def build_palette():
+    """
+    Builds the RGB values of the 256 colors palette:
+    16 system colors, a 6x6x6 color cube and a 24 steps grayscale ramp.
+    """
+    palette = [
+        (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+        (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+        (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+        (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255)
+    ]
+
+    for r in CUBE_LEVELS:
+        for g in CUBE_LEVELS:
+            for b in CUBE_LEVELS:
+                palette.append((r, g, b))
+
+    for level in GRAY_LEVELS:
+        palette.append((level, level, level))
+
+    return palette
+
+
+def nearest(levels, value):
+    return min(range(len(levels)), key=lambda i: abs(levels[i] - value))
+
+
+def distance(color, other):
+    return sum([(a - b) ** 2 for a, b in zip(color, other)])
+
+
+def nearest_color(colors, color):
+    return min(range(len(colors)), key=lambda i: distance(colors[i], color))
+
+
+CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+GRAY_LEVELS = tuple(range(8, 248, 10))
+PALETTE = build_palette()
+
 
 class OutputFormatterStyle(object):
 
@@ -33,9 +76,35 @@ class OutputFormatterStyle(object):
         'conceal': 8,
     }
 
+    # codes turning off each option
+    RESET_OPTIONS = {
+        1: 22,
+        4: 24,
+        5: 25,
+        7: 27,
+        8: 28
+    }
+
+    # the number of colors to render, detected from the terminal by default
+    color_depth = None
+
+    # lookup tables used to downsample colors
+    PALETTE = PALETTE
+    CUBE_INDEXES = [nearest(CUBE_LEVELS, value) for value in range(256)]
+    GRAY_INDEXES = [nearest(GRAY_LEVELS, value) for value in range(256)]
+    BASIC_INDEXES = range(8) * 2 + [nearest_color(PALETTE[:8], color) for color in PALETTE[16:]]
+
+    # incremented when a style already rendered is changed
+    revision = 0
+
+    # arbitrary colors make the number of pairs of states unbounded
+    __transitions = LRUCache(1024)
+
     def __init__(self, foreground=None, background=None, options=None):
         self.foreground = None
         self.background = None
+        self.__sequences = None
+        self.__state = None
 
         if foreground:
             self.set_foreground(foreground)
@@ -50,26 +119,121 @@ class OutputFormatterStyle(object):
         self.set_options(options)
 
     def set_foreground(self, foreground):
-        self.foreground = self.__class__.FOREGROUND_COLORS[foreground]
+        """
+        Sets the foreground color.
+
+        @param foreground: A color name, a #rrggbb (or #rgb) code or a 0-255 palette index
+        @type foreground: str or int
+        """
+        self.foreground = self.get_color_code(foreground)
+        self.invalidate()
 
     def set_background(self, background):
-        self.background = self.__class__.BACKGROUND_COLORS[background]
+        """
+        Sets the background color.
+
+        @param background: A color name, a #rrggbb (or #rgb) code or a 0-255 palette index
+        @type background: str or int
+        """
+        self.background = self.get_color_code(background, True)
+        self.invalidate()
+
+    @classmethod
+    def get_color_code(cls, color, background=False):
+        """
+        Returns the SGR code of a color,
+        downsampled to the number of colors supported by the terminal.
+
+        @param color: A color name, a #rrggbb (or #rgb) code or a 0-255 palette index
+        @type color: str or int
+        @param background: Whether the color is a background color or not
+        @type background: bool
+
+        @rtype: int or str
+        """
+        colors = cls.BACKGROUND_COLORS if background else cls.FOREGROUND_COLORS
+        if color in colors:
+            return colors[color]
+
+        depth = cls.color_depth or Terminal.get_color_depth()
+        extended = 48 if background else 38
+        color = str(color)
+        index = None
+
+        if color.startswith('#') and len(color) in (4, 7):
+            hex_color = color[1:] if len(color) == 7 else ''.join([c * 2 for c in color[1:]])
+            try:
+                rgb = tuple([int(hex_color[i:i + 2], 16) for i in (0, 2, 4)])
+            except ValueError:
+                rgb = None
+
+            if rgb is not None:
+                if depth >= Terminal.COLORS_TRUECOLOR:
+                    return '%d;2;%d;%d;%d' % ((extended,) + rgb)
+
+                index = cls.get_palette_index(*rgb)
+        elif color.isdigit() and int(color) < 256:
+            index = int(color)
+
+        if index is None:
+            raise Exception('Invalid %s color specified: "%s". Expected one of (%s), '
+                            'a #rrggbb code or a 0-255 palette index'
+                            % ('background' if background else 'foreground', color, ', '.join(colors.keys())))
+
+        if depth >= Terminal.COLORS_256:
+            return '%d;5;%d' % (extended, index)
+
+        return (40 if background else 30) + cls.BASIC_INDEXES[index]
+
+    @classmethod
+    def get_palette_index(cls, r, g, b):
+        """
+        Returns the index of the closest color of the 256 colors palette.
+
+        @rtype: int
+        """
+        cube = 16 + 36 * cls.CUBE_INDEXES[r] + 6 * cls.CUBE_INDEXES[g] + cls.CUBE_INDEXES[b]
+        gray = 232 + cls.GRAY_INDEXES[(r + g + b) // 3]
+
+        if distance(cls.PALETTE[gray], (r, g, b)) < distance(cls.PALETTE[cube], (r, g, b)):
+            return gray
+
+        return cube
 
     def set_option(self, option):
         if option not in self.OPTIONS:
             raise Exception('Invalid option specified: "%s". Expected one of (%s)'
                             % (option, ', '.join(self.OPTIONS.keys())))
 
-        if option not in self.options:
+        if self.OPTIONS[option] not in self.options:
             self.options.append(self.OPTIONS[option])
+            self.invalidate()
 
     def set_options(self, options):
         self.options = []
+        self.invalidate()
 
         for option in options:
             self.set_option(option)
 
-    def apply(self, text):
+    def invalidate(self):
+        """
+        Forgets the escape sequences of the style after a change.
+
+        Formatters drop the messages they rendered
+        when a style they may have used changes.
+        """
+        if self.__sequences is not None:
+            OutputFormatterStyle.revision += 1
+
+        self.__sequences = None
+
+    def get_codes(self):
+        """
+        Returns the SGR codes of the style.
+
+        @rtype: list
+        """
         codes = []
 
         if self.foreground:
@@ -81,7 +245,96 @@ class OutputFormatterStyle(object):
         if len(self.options):
             codes += self.options
 
-        if not len(codes):
-            return text
+        return codes
+
+    def get_sequences(self):
+        """
+        Returns the escape sequences starting and ending the style.
+
+        They are computed once and cached until the style changes.
+
+        @return: The start and end sequences
+        @rtype: tuple
+        """
+        if self.__sequences is None:
+            codes = self.get_codes()
+
+            if codes:
+                self.__sequences = ('\033[%sm' % ';'.join(map(str, codes)), '\033[0m')
+                self.__state = (self.foreground, self.background, tuple(self.options))
+            else:
+                self.__sequences = ('', '')
+                self.__state = None
+
+        return self.__sequences
+
+    def get_state(self):
+        """
+        Returns the terminal state set by the style.
+
+        @return: A (foreground, background, options) tuple or None for the default state
+        @rtype: tuple or None
+        """
+        if self.__sequences is None:
+            self.get_sequences()
+
+        return self.__state
+
+    @classmethod
+    def get_transition(cls, previous, state):
+        """
+        Returns the shortest escape sequence switching the terminal
+        from a state to another.
+
+        @param previous: The current state, None for the default state
+        @type previous: tuple or None
+        @param state: The state to switch to, None for the default state
+        @type state: tuple or None
+
+        @rtype: str
+        """
+        key = (previous, state)
+        transition = cls.__transitions.get(key)
+        if transition is not None:
+            return transition
+
+        if state is None:
+            transition = '\033[0m' if previous is not None else ''
+        else:
+            foreground, background, options = state
+            codes = [code for code in (foreground, background) if code] + list(options)
+            transition = '\033[%sm' % ';'.join(map(str, codes))
+
+            if previous is not None:
+                # either change what differs or reset and start over
+                transition = '\033[0;%sm' % ';'.join(map(str, codes))
+
+                codes = [cls.RESET_OPTIONS[option] for option in previous[2] if option not in options]
+                codes += [option for option in options if option not in previous[2]]
+                if foreground != previous[0]:
+                    codes.append(foreground or 39)
+                if background != previous[1]:
+                    codes.append(background or 49)
+
+                if not codes:
+                    transition = ''
+                else:
+                    transition = min('\033[%sm' % ';'.join(map(str, codes)), transition, key=len)
+
+        cls.__transitions.set(key, transition)
+
+        return transition
+
+    @classmethod
+    def get_transition_cache_info(cls):
+        """
+        Returns the statistics of the transitions cache.
+
+        @rtype: dict
+        """
+        return cls.__transitions.get_info()
+
+    def apply(self, text):
+        start, end = self.__sequences or self.get_sequences()
 
-        return '\033[%sm%s\033[0m' % (';'.join(map(str, codes)), text)
\ No newline at end of file
+        return start + text + end
\ No newline at end of file
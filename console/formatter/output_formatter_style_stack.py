@@ -16,13 +16,42 @@ class OutputFormatterStyleStack(object):
         self.styles.append(style)
 
     def pop(self, style=None):
+        """
+        Pops a style from the stack.
+
+        When a style is given, it is popped along with the styles
+        pushed after it. The style itself is looked for first, then
+        a style rendering the same way.
+
+        @param style: The style to pop
+        @type style: OutputFormatterStyle
+
+        @return: The popped style
+        @rtype: OutputFormatterStyle
+        """
         if not len(self.styles):
             return self.empty_style
 
         if not style:
             return self.styles.pop()
 
-        return self.styles.pop(self.styles.index(style))
+        indexes = range(len(self.styles) - 1, -1, -1)
+        for index in indexes:
+            if self.styles[index] is style:
+                return self.pop_from(index)
+
+        sequences = style.get_sequences()
+        for index in indexes:
+            if self.styles[index].get_sequences() == sequences:
+                return self.pop_from(index)
+
+        raise ValueError('Incorrectly nested style tag found.')
+
+    def pop_from(self, index):
+        stacked = self.styles[index]
+        del self.styles[index:]
+
+        return stacked
 
     def get_current(self):
         if not len(self.styles):
@@ -5,6 +5,8 @@ import os
 
 from helper import Helper
 from ..formatter.output_formatter_style import OutputFormatterStyle
+from ..formatter.display_width import DisplayWidth
+from ..terminal import Terminal
 
 
 class DialogHelper(Helper):
@@ -13,7 +15,6 @@ class DialogHelper(Helper):
     """
 
     input_stream = None
-    stty = None
 
     def select(self, output_, question, choices,
                default=None, attempts=False, error_message='Value "%s" is invalid'):
@@ -36,14 +37,14 @@ class DialogHelper(Helper):
         @return: The selected value (the key of the choices array)
         @rtype: integer or str
         """
-        width = max(map(len, choices))
+        width = len(str(len(choices) - 1))
 
         if not isinstance(question, (list, tuple)):
             question = [question]
 
-        messages = question
+        messages = list(question)
         for key, value in enumerate(choices):
-            messages.append('  [<info>%-*s</info>] %s' % (width, key, value))
+            messages.append('  [<info>%s</info>] %s' % (DisplayWidth.pad(str(key), width), value))
 
         output_.write(messages)
 
@@ -79,6 +80,7 @@ class DialogHelper(Helper):
         @rtype: str
         """
         output_.write(question)
+        output_.flush()
 
         input_stream = self.input_stream or sys.stdin
 
@@ -106,6 +108,7 @@ class DialogHelper(Helper):
 
             # Read a keypress
             while True:
+                output_.flush()
                 c = input_stream.read(1)
 
                 # Backspace character
@@ -259,13 +262,7 @@ class DialogHelper(Helper):
         return 'dialog'
 
     def has_stty_available(self):
-        if self.stty is not None:
-            return self.stty
-
-        exit_code = os.system('stty 2>&1')
-        self.stty = exit_code
-
-        return self.stty == 0
+        return Terminal.has_stty()
 
     def validate_attempts(self, interviewer, output_, validator, attempts):
         """
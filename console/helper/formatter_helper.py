@@ -2,6 +2,8 @@
 
 from helper import Helper
 from ..formatter.output_formatter import OutputFormatter
+from ..formatter.display_width import DisplayWidth
+from ..terminal import Terminal
 
 
 class FormatterHelper(Helper):
@@ -12,24 +14,26 @@ class FormatterHelper(Helper):
     def format_block(self, messages, style, large=False):
         messages = [messages] if not isinstance(messages, (list, tuple)) else messages
 
+        # long messages are wrapped to fit the terminal along with their padding
+        columns = max(1, Terminal.get_columns() - (4 if large else 2))
+
         l = 0
         lines = []
         for message in messages:
-            message = OutputFormatter.escape(message)
-            lines.append(('  %s  ' if large else ' %s ') % message)
-            l = max(len(message) + (4 if large else 2), l)
+            for line in DisplayWidth.wrap(message, columns):
+                line = ('  %s  ' if large else ' %s ') % line
+                width = DisplayWidth.get_width(line)
+                lines.append((OutputFormatter.escape(line), width))
+                l = max(width, l)
 
-        messages = ' ' * l if large else []
-        for line in lines:
-            messages.append(line + ' ' * (l - len(line)))
+        messages = [' ' * l] if large else []
+        for line, width in lines:
+            messages.append(line + ' ' * (l - width))
 
         if large:
             messages.append(' ' * l)
 
-        for message in messages:
-            message = '<%s>%s</%s>' % (style, message, style)
-
-        return '\n'.join(messages)
+        return '\n'.join(['<%s>%s</%s>' % (style, message, style) for message in messages])
 
     def get_name(self):
         return 'formatter'
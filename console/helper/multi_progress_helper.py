@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from helper import Helper
+from progress_helper import ProgressHelper
+from ..terminal import Terminal
+
+
+class MultiProgressHelper(Helper):
+    """
+    The MultiProgress class displays several progress bars, one per line.
+
+    Bars only ask for a refresh when they advance. A single thread
+    redraws all the bars at most once per refresh interval, moving
+    the cursor up to the first bar. Bars reading their steps from
+    a counter are redrawn when the counter changes.
+    On undecorated outputs the bars are only drawn once, when finishing.
+
+    Usage:
+    >>> multi = MultiProgressHelper()
+    >>> multi.start(output_)
+    >>> download = multi.add(100)
+    >>> download.advance()
+    >>> download.finish()
+    >>> multi.finish()
+    """
+
+    refresh_interval = 0.1
+
+    def __init__(self):
+        self.bars = []
+        self.output = None
+        self.lines = 0
+
+        self.__lock = threading.RLock()
+        self.__dirty = False
+        self.__stopped = threading.Event()
+        self.__thread = None
+
+    def set_refresh_interval(self, interval):
+        """
+        Sets the refresh interval
+
+        @param interval: The number of seconds between two refreshes
+        @type interval: float
+        """
+        self.refresh_interval = interval
+
+    def start(self, output_):
+        """
+        Starts the progress display
+
+        @param output_: An Output instance
+        @type output_: Output
+        """
+        self.output = output_
+        self.bars = []
+        self.lines = 0
+        self.__dirty = False
+        self.__stopped.clear()
+
+        if output_.is_decorated():
+            self.__thread = threading.Thread(target=self.run)
+            self.__thread.daemon = True
+            self.__thread.start()
+
+    def add(self, max_steps=None, progress=None):
+        """
+        Adds a progress bar below the others and starts it
+
+        @param max_steps: Maximum steps
+        @type max_steps: int
+        @param progress: The progress bar to add (a new one by default)
+        @type progress: ProgressHelper
+
+        @return: The started progress bar
+        @rtype: ProgressHelper
+        """
+        if self.output is None:
+            raise Exception('You must start the progress display before calling add().')
+
+        if progress is None:
+            progress = ProgressHelper()
+
+        progress.multi_progress = self
+        progress.start(self.output, max_steps)
+
+        with self.__lock:
+            self.bars.append(progress)
+
+        self.request_refresh()
+
+        return progress
+
+    def request_refresh(self):
+        """
+        Asks for the bars to be redrawn by the next refresh.
+        """
+        self.__dirty = True
+
+    def run(self):
+        while not self.__stopped.wait(self.refresh_interval):
+            if self.__dirty or self.has_counter_changed():
+                self.refresh()
+
+    def has_counter_changed(self):
+        """
+        Returns whether a bar reading its steps from a counter has advanced since its last redraw.
+
+        @rtype: bool
+        """
+        for bar in list(self.bars):
+            if bar.counter is not None and bar.counter.get_value() != bar.last_redraw_step:
+                return True
+
+        return False
+
+    def refresh(self):
+        """
+        Redraws all the bars.
+        """
+        with self.__lock:
+            self.__dirty = False
+            if not self.bars:
+                return
+
+            # lines scrolled out of the terminal cannot be reached anymore
+            bars = self.bars[:max(1, Terminal.get_rows() - 1)]
+
+            parts = []
+            if self.lines > 1:
+                # cursor up to the first bar
+                parts.append('\033[%dA' % (self.lines - 1))
+            if self.lines:
+                parts.append('\x0D')
+
+            # clear each line before drawing its bar
+            parts.append('\n'.join(['\033[2K' + bar.get_message(bar.finished) for bar in bars]))
+
+            self.output.write(''.join(parts))
+            self.lines = len(bars)
+
+    def finish(self):
+        """
+        Finishes the progress display, after drawing all the bars one last time
+        """
+        if self.output is None:
+            raise Exception('You must start the progress display before calling finish().')
+
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+        if self.output.is_decorated():
+            self.refresh()
+            self.output.writeln('')
+        else:
+            with self.__lock:
+                self.output.writeln([bar.get_message(bar.finished) for bar in self.bars])
+
+        for bar in self.bars:
+            bar.multi_progress = None
+            bar.start_time = None
+            bar.output = None
+
+        self.output = None
+
+    def get_name(self):
+        return 'multi_progress'
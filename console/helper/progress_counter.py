@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+import multiprocessing
+
+
+class ProgressCounter(object):
+    """
+    ProgressCounter counts the steps done by several threads.
+
+    Each thread increments its own slot, so advancing never takes
+    a lock. The value is the sum of the slots, read by the thread
+    drawing the progress bar.
+
+    Usage:
+    >>> counter = ProgressCounter()
+    >>> progress.set_counter(counter)
+    >>> # in each worker thread
+    >>> counter.advance()
+    """
+
+    def __init__(self):
+        self.__slots = []
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+
+    def advance(self, step=1):
+        """
+        Advances the counter of the current thread
+
+        @param step: Number of steps to advance
+        @type step: int
+        """
+        try:
+            slot = self.__local.slot
+        except AttributeError:
+            slot = self.__local.slot = [0]
+
+            # only taken once per thread
+            with self.__lock:
+                self.__slots.append(slot)
+
+        slot[0] += step
+
+    def get_value(self):
+        """
+        Returns the number of steps done by all the threads
+
+        @rtype: int
+        """
+        return sum([slot[0] for slot in list(self.__slots)])
+
+
+class SharedProgressCounter(object):
+    """
+    SharedProgressCounter counts the steps done by several processes.
+
+    The counter lives in shared memory and each process increments
+    its own slot without locking. Processes beyond the number of slots
+    share a last slot protected by a lock.
+
+    The counter must be given to the worker processes when they are
+    created, as an argument of multiprocessing.Process or of the
+    initializer of a multiprocessing.Pool.
+
+    Usage:
+    >>> counter = SharedProgressCounter(4)
+    >>> progress.set_counter(counter)
+    >>> pool = multiprocessing.Pool(4, init_worker, (counter,))
+    >>> # in each worker process
+    >>> counter.advance()
+    """
+
+    def __init__(self, slots=None):
+        """
+        Constructor
+
+        @param slots: The number of lock free slots (defaults to the number of CPUs)
+        @type slots: int
+        """
+        if slots is None:
+            slots = multiprocessing.cpu_count()
+
+        self.__values = multiprocessing.RawArray('l', slots + 1)
+        self.__next_slot = multiprocessing.Value('i', 0)
+        self.__lock = multiprocessing.Lock()
+        self.__slots = slots
+
+        self.__local = threading.local()
+
+    def advance(self, step=1):
+        """
+        Advances the counter of the current process
+
+        @param step: Number of steps to advance
+        @type step: int
+        """
+        slot = self.get_slot()
+        if slot is None:
+            with self.__lock:
+                self.__values[self.__slots] += step
+        else:
+            self.__values[slot] += step
+
+    def get_slot(self):
+        """
+        Returns the slot of the current thread, claiming a free one if needed.
+
+        @return: The index of the slot or None if there is no free slot left
+        @rtype: int or None
+        """
+        pid = os.getpid()
+        local = self.__local
+
+        # the slot of a thread is not the slot of a forked process
+        if getattr(local, 'pid', None) != pid:
+            with self.__next_slot.get_lock():
+                slot = self.__next_slot.value
+                self.__next_slot.value += 1
+
+            local.pid = pid
+            local.slot = slot if slot < self.__slots else None
+
+        return local.slot
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_SharedProgressCounter__local']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__local = threading.local()
+
+    def get_value(self):
+        """
+        Returns the number of steps done by all the processes
+
+        @rtype: int
+        """
+        return sum(self.__values[:])
@@ -1,10 +1,20 @@
 # -*- coding: utf-8 -*-
 
+import os
+import re
+import sys
 import time
 import math
+from bisect import bisect_right
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 from helper import Helper
-from ..output.output import Output
+from ..formatter.display_width import DisplayWidth
+from ..terminal import Terminal
 
 
 class ProgressHelper(Helper):
@@ -18,6 +28,13 @@ class ProgressHelper(Helper):
     FORMAT_QUIET_NOMAX = ' %{current}%'
     FORMAT_NORMAL_NOMAX = ' %current% [%bar%]'
     FORMAT_VERBOSE_NOMAX = ' %current% [%bar%] Elapsed: %elapsed%'
+    FORMAT_DEBUG = ' %current%/%max% [%bar%] %percent%% %elapsed%/%estimated% %rate% %memory%'
+    FORMAT_DEBUG_NOMAX = ' %current% [%bar%] %elapsed% %rate% %memory%'
+
+    PLACEHOLDER_PATTERN = re.compile('%(current|max|bar|percent|elapsed|remaining|estimated|rate|memory)%')
+
+    # the format variables that need the rate
+    RATE_VARS = ('remaining', 'estimated', 'rate')
 
     # options
     bar_width = 28
@@ -26,9 +43,18 @@ class ProgressHelper(Helper):
     progress_char = '>'
     display_format = None
     redraw_freq = 1
+    redraw_interval = 0.1
+    rate_window = 5.0
 
     last_messages_length = None
     bar_char_original = None
+    last_redraw_step = 0
+    last_redraw_time = 0
+
+    # smoothed number of steps per second, once measured over rate_min_time seconds
+    rate = None
+    rate_min_time = 0.5
+    track_rate = False
 
     output = None
     current_step = 0
@@ -40,16 +66,31 @@ class ProgressHelper(Helper):
         'max',
         'bar',
         'percent',
-        'elapsed'
+        'elapsed',
+        'remaining',
+        'estimated',
+        'rate',
+        'memory'
     ]
 
     format_vars = []
 
+    # the display format split on its placeholders and the (index, name) of the placeholders to fill
+    template = []
+    slots = []
+
+    # the bars for each number of complete characters, by bar width and characters
+    bar_tables = {}
+
     widths = {
         'current': 4,
         'max': 4,
         'percent': 3,
-        'elapsed': 6
+        'elapsed': 6,
+        'remaining': 6,
+        'estimated': 6,
+        'rate': 8,
+        'memory': 9
     }
 
     time_formats = [
@@ -64,6 +105,30 @@ class ProgressHelper(Helper):
         (604800, 'days', 86400)
     ]
 
+    time_thresholds = [time_format[0] for time_format in time_formats]
+
+    memory_units = [
+        (1024, 'B', 1),
+        (1024 * 1024, 'KiB', 1024),
+        (1024 * 1024 * 1024, 'MiB', 1024 * 1024),
+        (None, 'GiB', 1024 * 1024 * 1024)
+    ]
+
+    def __init__(self):
+        # per instance copies of the mutable defaults
+        self.widths = dict(self.widths)
+        self.format_vars = []
+        self.template = []
+        self.slots = []
+        self.bar_tables = {}
+
+        # the MultiProgressHelper displaying this bar, if any
+        self.multi_progress = None
+        self.finished = False
+
+        # the counter the steps are read from, if any
+        self.counter = None
+
     def set_bar_width(self, size):
         """
         Sets the progress bar with
@@ -100,6 +165,18 @@ class ProgressHelper(Helper):
         """
         self.progress_char = char
 
+    def set_counter(self, counter):
+        """
+        Reads the current step from a counter advanced by other threads or processes
+
+        The counter is read when the bar is drawn, by display()
+        or by the refresher of a MultiProgressHelper.
+
+        @param counter: The counter, None to stop reading from a counter
+        @type counter: ProgressCounter or SharedProgressCounter
+        """
+        self.counter = counter
+
     def set_display_format(self, display_format):
         """
         Sets the progress bar format
@@ -113,10 +190,30 @@ class ProgressHelper(Helper):
         """
         Sets the redraw frequency
 
-        @param freq: The redraw frequency in seconds
+        @param freq: The minimum number of steps between two redraws
         @type freq: int
         """
-        self.bar_char = freq
+        self.redraw_freq = max(1, int(freq))
+
+    def set_redraw_interval(self, interval):
+        """
+        Sets the redraw interval
+
+        @param interval: The minimum number of seconds between two redraws
+        @type interval: float
+        """
+        self.redraw_interval = interval
+
+    def set_rate_window(self, window):
+        """
+        Sets the time window the rate is averaged over
+
+        Older steps weigh exponentially less in the rate.
+
+        @param window: The time window in seconds
+        @type window: float
+        """
+        self.rate_window = window
 
     def start(self, output_, max_steps=None):
         """
@@ -128,16 +225,26 @@ class ProgressHelper(Helper):
         @type max_steps: int
         """
         self.start_time = time.time()
+        self.finished = False
         self.current_step = 0
+        self.last_redraw_step = 0
+        self.last_redraw_time = 0
+        self.rate = None
+        self.rate_average = 0.0
+        self.rate_weight = 0.0
         self.max_steps = int(max_steps or 0)
         self.output = output_
 
         if self.display_format is None:
-            if self.output.get_verbosity() == Output.VERBOSITY_QUIET:
+            if self.output.is_quiet():
                 self.display_format = self.FORMAT_QUIET_NOMAX
                 if self.max_steps > 0:
                     self.display_format = self.FORMAT_QUIET
-            elif self.output.get_verbosity() == Output.VERBOSITY_VERBOSE:
+            elif self.output.is_debug():
+                self.display_format = self.FORMAT_DEBUG_NOMAX
+                if self.max_steps > 0:
+                    self.display_format = self.FORMAT_DEBUG
+            elif self.output.is_verbose():
                 self.display_format = self.FORMAT_VERBOSE_NOMAX
                 if self.max_steps > 0:
                     self.display_format = self.FORMAT_VERBOSE
@@ -152,9 +259,12 @@ class ProgressHelper(Helper):
         """
         Advances the progress output X steps
 
+        The output is redrawn once enough steps and time
+        have passed since the last redraw.
+
         @param step: Number of steps to advance
         @type step: int
-        @param redraw: Whether to redraw or not
+        @param redraw: Whether to force a redraw or not
         @type redraw: bool
         """
         if self.start_time is None:
@@ -164,7 +274,10 @@ class ProgressHelper(Helper):
             redraw = True
 
         self.current_step += step
-        if redraw or self.current_step % self.redraw_freq == 0:
+        if redraw:
+            self.display()
+        elif self.current_step - self.last_redraw_step >= self.redraw_freq \
+                and time.time() - self.last_redraw_time >= self.redraw_interval:
             self.display()
 
     def display(self, finish=False):
@@ -177,11 +290,59 @@ class ProgressHelper(Helper):
         if self.start_time is None:
             raise Exception('You must start the progress bar before calling display().')
 
-        message = self.display_format
-        for name, value in self.generate(finish).items():
-            message = message.replace('%' + name + '%', str(value))
+        if self.multi_progress is not None:
+            # drawn by the next refresh of the multiple progress display
+            self.multi_progress.request_refresh()
 
-        self.overwrite(self.output, message)
+            return
+
+        self.overwrite(self.output, self.get_message(finish))
+
+    def get_message(self, finish=False):
+        """
+        Returns the current progress line and records it as drawn.
+
+        @param finish: Forces the end result
+        @type finish: bool
+
+        @rtype: str
+        """
+        if self.counter is not None:
+            self.current_step = self.counter.get_value()
+
+        now = time.time()
+        if self.track_rate:
+            self.update_rate(now)
+
+        self.last_redraw_step = self.current_step
+        self.last_redraw_time = now
+
+        message = self.build(finish)
+
+        if self.output.is_decorated() and 'bar' in self.format_vars:
+            # shrink the bar so that the line fits in the terminal
+            overflow = DisplayWidth.get_width(message, self.output.get_formatter()) - Terminal.get_columns() + 1
+            if overflow > 0:
+                message = self.build(finish, max(1, self.bar_width - overflow))
+
+        return message
+
+    def build(self, finish=False, bar_width=None):
+        """
+        Fills the placeholders of the compiled display format.
+
+        @param finish: Forces the end result
+        @type finish: bool
+        @param bar_width: The width of the bar (defaults to the bar width option)
+        @type bar_width: int
+
+        @rtype: str
+        """
+        line = self.template[:]
+        for index, name in self.slots:
+            line[index] = self.format_var(name, finish, bar_width)
+
+        return ''.join(line)
 
     def finish(self):
         """
@@ -190,9 +351,24 @@ class ProgressHelper(Helper):
         if self.start_time is None:
             raise Exception('You must start the progress bar before calling finish().')
 
+        if self.counter is not None:
+            self.current_step = self.counter.get_value()
+
+        if self.multi_progress is not None:
+            if not self.max_steps:
+                self.bar_char = self.bar_char_original
+
+            self.finished = True
+            self.multi_progress.request_refresh()
+
+            return
+
         if not self.max_steps:
             self.bar_char = self.bar_char_original
             self.display(True)
+        elif self.current_step != self.last_redraw_step:
+            # the last steps may not have been drawn
+            self.display(True)
 
         self.start_time = None
         self.output.writeln('')
@@ -200,13 +376,8 @@ class ProgressHelper(Helper):
 
     def initialize(self):
         """
-        Initializes the progress output
+        Initializes the progress output and compiles the display format
         """
-        self.format_vars = []
-        for v in self.default_format_vars:
-            if self.display_format.find('%' + v + '%') != -1:
-                self.format_vars.append(v)
-
         if self.max_steps > 0:
             self.widths['max'] = len(str(self.max_steps))
             self.widths['current'] = self.widths['max']
@@ -214,57 +385,213 @@ class ProgressHelper(Helper):
             self.bar_char_original = self.bar_char
             self.bar_char = self.empty_bar_char
 
-    def generate(self, finish=False):
+        # odd indexes are placeholders
+        self.template = self.PLACEHOLDER_PATTERN.split(self.display_format)
+        self.slots = []
+        self.format_vars = []
+        for index in range(1, len(self.template), 2):
+            name = self.template[index]
+            if name not in self.format_vars:
+                self.format_vars.append(name)
+
+            if name == 'max':
+                # constant while running
+                self.template[index] = self.format_var(name)
+            else:
+                self.slots.append((index, name))
+
+        self.track_rate = any([name in self.format_vars for name in self.RATE_VARS])
+        self.bar_tables = {}
+        self.time_thresholds = [time_format[0] for time_format in self.time_formats]
+
+    def generate(self, finish=False, bar_width=None):
         """
         Generates the array map of format variables to values.
 
         @param finish: Forces the end result
         @type finish: bool
+        @param bar_width: The width of the bar (defaults to the bar width option)
+        @type bar_width: int
 
         @return: A dict of format vars and values
         @rtype: dict
         """
-        format_vars = {}
-        percent = 0
+        return dict([(name, self.format_var(name, finish, bar_width)) for name in self.format_vars])
+
+    def format_var(self, name, finish=False, bar_width=None):
+        """
+        Returns the value of a format variable.
+
+        @param name: The name of the format variable
+        @type name: str
+        @param finish: Forces the end result
+        @type finish: bool
+        @param bar_width: The width of the bar (defaults to the bar width option)
+        @type bar_width: int
+
+        @rtype: str
+        """
+        if name == 'bar':
+            return self.format_bar(finish, bar_width)
+        elif name == 'current':
+            return str(self.current_step).rjust(self.widths['current'], ' ')
+        elif name == 'percent':
+            return str(int(round(self.get_percent() * 100))).rjust(self.widths['percent'], ' ')
+        elif name == 'elapsed':
+            return self.humane_time(time.time() - self.start_time).rjust(self.widths['elapsed'], ' ')
+        elif name == 'max':
+            return str(self.max_steps)
+        elif name == 'remaining':
+            return self.format_duration(self.get_remaining()).rjust(self.widths['remaining'], ' ')
+        elif name == 'estimated':
+            remaining = self.get_remaining()
+            if remaining is not None:
+                remaining += time.time() - self.start_time
+
+            return self.format_duration(remaining).rjust(self.widths['estimated'], ' ')
+        elif name == 'rate':
+            return ('%.1f/s' % (self.rate or 0)).rjust(self.widths['rate'], ' ')
+        elif name == 'memory':
+            return self.format_memory(self.get_memory()).rjust(self.widths['memory'], ' ')
+
+    def update_rate(self, now):
+        """
+        Updates the moving average of the rate with the steps done since the last redraw.
+
+        The average starts from zero and is divided by the total weight
+        of the intervals measured so far, so the first intervals are not
+        given more weight than the time they lasted. The rate is only
+        reported once measured over rate_min_time seconds.
+
+        @param now: The current time
+        @type now: float
+        """
+        elapsed = now - max(self.last_redraw_time, self.start_time)
+        if elapsed <= 0:
+            return
+
+        # weigh the current rate by the time it was measured over
+        weight = 1 - math.exp(-elapsed / self.rate_window) if self.rate_window > 0 else 1
+        current_rate = (self.current_step - self.last_redraw_step) / elapsed
+        self.rate_average += weight * (current_rate - self.rate_average)
+        self.rate_weight += weight * (1 - self.rate_weight)
+
+        if self.rate_weight and now - self.start_time >= self.rate_min_time:
+            self.rate = self.rate_average / self.rate_weight
+
+    def get_remaining(self):
+        """
+        Returns the estimated number of seconds left.
+
+        @return: The number of seconds or None if it cannot be estimated yet
+        @rtype: float or None
+        """
+        if self.max_steps <= 0 or not self.rate:
+            return None
+
+        return max(0, self.max_steps - self.current_step) / self.rate
+
+    def get_memory(self):
+        """
+        Returns the memory used by the process.
+
+        @return: The resident memory in bytes or None if it cannot be known
+        @rtype: int or None
+        """
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (IOError, OSError, ValueError, IndexError, AttributeError):
+            pass
+
+        if resource is None:
+            return None
+
+        # peak resident memory, in kilobytes on Linux and bytes on Mac OS X
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        return rss if sys.platform == 'darwin' else rss * 1024
+
+    def format_duration(self, secs):
+        if secs is None:
+            return '???'
+
+        return self.humane_time(secs)
+
+    def format_memory(self, size):
+        """
+        Converts a number of bytes into human-readable format
+
+        @param size: Number of bytes
+        @type size: int
+
+        @return: Memory in human-readable format
+        @rtype: str
+        """
+        if size is None:
+            return '???'
+
+        for limit, unit, divisor in self.memory_units:
+            if limit is None or size < limit:
+                if divisor == 1:
+                    return '%d %s' % (size, unit)
+
+                return '%.1f %s' % (float(size) / divisor, unit)
+
+    def get_percent(self):
         if self.max_steps > 0:
-            percent = round(float(self.current_step) / self.max_steps, 2)
+            return round(float(self.current_step) / self.max_steps, 2)
 
-        # bar
-        if 'bar' in self.format_vars:
-            if self.max_steps > 0:
-                complete_bars = math.floor(percent * self.bar_width)
-            else:
-                if not finish:
-                    complete_bars = math.floor(self.current_step % self.bar_width)
-                else:
-                    complete_bars = self.bar_width
+        return 0
 
-            empty_bars = self.bar_width - complete_bars - len(self.progress_char)
-            bar = self.bar_char * int(complete_bars)
-            if complete_bars < self.bar_width:
-                bar += self.progress_char
-                bar += self.empty_bar_char * int(empty_bars)
+    def format_bar(self, finish=False, bar_width=None):
+        """
+        Returns the bar for the current step.
 
-            format_vars['bar'] = bar
+        @param finish: Forces the end result
+        @type finish: bool
+        @param bar_width: The width of the bar (defaults to the bar width option)
+        @type bar_width: int
+
+        @rtype: str
+        """
+        if bar_width is None:
+            bar_width = self.bar_width
+
+        if self.max_steps > 0:
+            complete_bars = int(math.floor(self.get_percent() * bar_width))
+        elif not finish:
+            complete_bars = self.current_step % bar_width
+        else:
+            complete_bars = bar_width
+
+        return self.get_bar_table(bar_width)[min(complete_bars, bar_width)]
 
-        # elapsed
-        if 'elapsed' in self.format_vars:
-            elapsed = time.time() - self.start_time
-            format_vars['elapsed'] = self.humane_time(elapsed).rjust(self.widths['elapsed'], ' ')
+    def get_bar_table(self, bar_width):
+        """
+        Returns the bars of a given width for each number of complete characters.
 
-        # current
-        if 'current' in self.format_vars:
-            format_vars['current'] = str(self.current_step).rjust(self.widths['current'], ' ')
+        @param bar_width: The width of the bar
+        @type bar_width: int
 
-        # max steps
-        if 'max' in self.format_vars:
-            format_vars['max'] = self.max_steps
+        @return: A list of bar_width + 1 bars
+        @rtype: list
+        """
+        key = (bar_width, self.bar_char, self.empty_bar_char, self.progress_char)
+        table = self.bar_tables.get(key)
+        if table is None:
+            table = []
+            for complete_bars in range(bar_width + 1):
+                bar = self.bar_char * complete_bars
+                if complete_bars < bar_width:
+                    bar += self.progress_char
+                    bar += self.empty_bar_char * (bar_width - complete_bars - len(self.progress_char))
 
-        # percent
-        if 'percent' in self.format_vars:
-            format_vars['percent'] = str(int(round(percent * 100))).rjust(self.widths['percent'], ' ')
+                table.append(bar)
 
-        return format_vars
+            self.bar_tables[key] = table
+
+        return table
 
     def humane_time(self, secs):
         """
@@ -276,17 +603,15 @@ class ProgressHelper(Helper):
         @return: Time in human-readable format
         @rtype: str
         """
-        text = ''
-        for time_format in self.time_formats:
-            if secs < time_format[0]:
-                if len(time_format) == 2:
-                    text = time_format[1]
-                    break
-                else:
-                    text = str(math.ceil(secs / time_format[2])) + ' ' + time_format[1]
-                    break
+        index = bisect_right(self.time_thresholds, secs)
+        if index == len(self.time_formats):
+            return ''
+
+        time_format = self.time_formats[index]
+        if len(time_format) == 2:
+            return time_format[1]
 
-        return text
+        return '%d %s' % (math.ceil(float(secs) / time_format[2]), time_format[1])
 
     def overwrite(self, output_, messages):
         """
@@ -298,16 +623,19 @@ class ProgressHelper(Helper):
         @type messages: list or str
         """
         # carriage return
-        output_.write('\x0D')
+        prefix = '\x0D'
         if self.last_messages_length is not None:
-            # clear the line with the text of the last message
-            output_.write('\x20' * self.last_messages_length)
-            # carriage return
-            output_.write('\x0D')
+            # clear the line with the text of the last message and carriage return
+            prefix += '\x20' * self.last_messages_length + '\x0D'
 
-        output_.write(messages)
+        if isinstance(messages, (list, tuple)):
+            output_.write(prefix)
+            output_.write(messages)
+            messages = messages[-1] if messages else ''
+        else:
+            output_.write(prefix + messages)
 
-        self.last_messages_length = len(messages)
+        self.last_messages_length = DisplayWidth.get_width(messages, output_.get_formatter())
 
     def get_name(self):
         return 'progress'
\ No newline at end of file
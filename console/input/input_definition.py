@@ -8,6 +8,9 @@ except ImportError:
 from ordereddict import OrderedDict
 
 from input_option import InputOption
+from ..formatter.display_width import DisplayWidth
+from ..formatter.output_formatter import OutputFormatter
+from ..terminal import Terminal
 
 class InputDefinition(object):
 
@@ -183,16 +186,17 @@ class InputDefinition(object):
         # find the largest option or argument name
         mx = 0
         for option in self.get_options():
-            name_length = len(option.get_name()) + 2
+            name_length = DisplayWidth.get_width(option.get_name()) + 2
             if option.get_shortcut():
-                name_length += len(option.get_shortcut()) + 3
+                name_length += DisplayWidth.get_width(option.get_shortcut()) + 3
 
             mx = max(mx, name_length)
 
         for argument in self.get_arguments():
-            mx = max(mx, len(argument.get_name()))
+            mx = max(mx, DisplayWidth.get_width(argument.get_name()))
         mx += 1
 
+        formatter = OutputFormatter()
         text = []
 
         if self.get_arguments():
@@ -205,9 +209,9 @@ class InputDefinition(object):
                 else:
                     default = ''
 
-                description = argument.get_description().replace('\n', '\n' + ' ' * (mx + 2))
+                description = self.wrap_description(argument.get_description(), mx + 2, formatter)
 
-                text.append(' <info>%-*s</info> %s%s' % (mx, argument.get_name(), description, default))
+                text.append(' <info>%s</info> %s%s' % (DisplayWidth.pad(argument.get_name(), mx), description, default))
 
         if self.get_options():
             text.append('<comment>Options:</comment>')
@@ -221,13 +225,13 @@ class InputDefinition(object):
                     default = ''
 
                 multiple = '<comment> (multiple values allowed)</comment>' if option.is_array() else ''
-                description = option.get_description().replace('\n', '\n' + ' ' * (mx + 2))
+                description = self.wrap_description(option.get_description(), mx + 2, formatter)
 
-                option_max = mx - len(option.get_name()) - 2
-                text.append(' <info>%s</info> %-*s%s%s%s'
+                option_max = mx - DisplayWidth.get_width(option.get_name()) - 2
+                text.append(' <info>%s</info> %s%s%s%s'
                             % ('--' + option.get_name(),
-                               option_max,
-                               '(-%s) ' % option.get_shortcut() if option.get_shortcut() else '',
+                               DisplayWidth.pad('(-%s) ' % option.get_shortcut() if option.get_shortcut() else '',
+                                                option_max),
                                description,
                                default,
                                multiple))
@@ -236,5 +240,23 @@ class InputDefinition(object):
 
         return '\n'.join(text)
 
+    def wrap_description(self, description, indent, formatter):
+        """
+        Wraps a description to the width of the terminal,
+        indenting its lines after the first one.
+
+        @param description: The description to wrap
+        @type description: str
+        @param indent: The column the description starts at
+        @type indent: int
+        @param formatter: The formatter to recognize the style tags with
+        @type formatter: OutputFormatter
+
+        @rtype: str
+        """
+        lines = DisplayWidth.wrap(description, max(1, Terminal.get_columns() - indent), formatter)
+
+        return ('\n' + ' ' * indent).join(lines)
+
     def format_default_value(self, default):
         return json.dumps(default)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import os
+from output import Output
+from ..terminal import Terminal
+
+
+class AsyncStreamOutput(Output):
+    """
+    AsyncStreamOutput writes the output to an asyncio StreamWriter.
+
+    Writing only appends to the writer's transport buffer so it never
+    blocks the event loop. Coroutines apply backpressure by waiting
+    on drain() once they have written a batch of messages.
+
+    Usage:
+    >>> output_ = AsyncStreamOutput(writer)
+    >>> output_.writeln('<info>Downloaded</info> %s' % url)
+    >>> await output_.drain()
+    """
+
+    def __init__(self, writer, verbosity=Output.VERBOSITY_NORMAL, decorated=None, formatter=None,
+                 encoding='utf-8'):
+        """
+        Constructor
+
+        @param writer: A StreamWriter instance (asyncio or trollius)
+        @type writer: StreamWriter
+        @param verbosity: The verbosity level
+        @type verbosity: int
+        @param decorated: Whether to decorate messages or not (None to auto-detect)
+        @type decorated: bool or None
+        @param formatter: An OutputFormatter instance
+        @type formatter: OutputFormatter
+        @param encoding: The encoding used for unicode messages
+        @type encoding: str
+        """
+        self.writer = writer
+        self.encoding = encoding
+
+        if decorated is None:
+            decorated = self.has_color_support(decorated)
+
+        super(AsyncStreamOutput, self).__init__(verbosity, decorated, formatter)
+
+    def get_writer(self):
+        return self.writer
+
+    def do_write(self, message, newline):
+        if isinstance(message, unicode):
+            message = message.encode(self.encoding)
+
+        self.writer.write(message + (os.linesep if newline else ''))
+
+    def drain(self):
+        """
+        Waits until the writer's buffer has been flushed enough.
+
+        @return: An awaitable to wait on from a coroutine
+        """
+        return self.writer.drain()
+
+    def has_color_support(self, decorated):
+        pipe = self.writer.get_extra_info('pipe') if hasattr(self.writer, 'get_extra_info') else None
+
+        return Terminal.has_color_support(pipe)
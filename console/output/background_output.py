@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+from collections import deque
+
+from output import Output, OutputError
+
+
+class BackgroundOutput(Output):
+    """
+    BackgroundOutput formats messages in the calling thread and
+    queues them for a dedicated writer thread which writes them
+    to the underlying output.
+
+    The queue is bounded, the overflow policy decides what happens
+    when it is full:
+        * OVERFLOW_BLOCK: wait for the writer thread to catch up
+        * OVERFLOW_DROP_OLDEST: discard the oldest queued message
+        * OVERFLOW_COALESCE: append the message to the last queued one
+
+    The output is closed when the interpreter exits if it was not
+    closed before, so the queued messages are always written.
+
+    Usage:
+    >>> output_ = BackgroundOutput(ConsoleOutput())
+    >>> output_.writeln('<info>foo</info>')
+    >>> output_.close()
+    """
+
+    OVERFLOW_BLOCK = 'block'
+    OVERFLOW_DROP_OLDEST = 'drop_oldest'
+    OVERFLOW_COALESCE = 'coalesce'
+
+    def __init__(self, output_, max_size=1024, overflow=OVERFLOW_BLOCK):
+        """
+        Constructor
+
+        @param output_: The output the writer thread writes to
+        @type output_: Output
+        @param max_size: The maximum number of queued messages
+        @type max_size: int
+        @param overflow: The overflow policy
+        @type overflow: str
+        """
+        if overflow not in (self.OVERFLOW_BLOCK, self.OVERFLOW_DROP_OLDEST, self.OVERFLOW_COALESCE):
+            raise OutputError('Unknown overflow policy given (%s)' % overflow)
+
+        self.output = output_
+        self.max_size = max(1, int(max_size))
+        self.overflow = overflow
+        self.dropped = 0
+
+        self.__queue = deque()
+        self.__unfinished = 0
+        self.__closed = False
+        self.__error = None
+        self.__condition = threading.Condition()
+
+        super(BackgroundOutput, self).__init__(output_.get_verbosity(),
+                                               output_.is_decorated(),
+                                               output_.get_formatter())
+
+        self.__thread = threading.Thread(target=self.run_writer, name='BackgroundOutput')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+        self.close_at_exit()
+
+    def get_output(self):
+        return self.output
+
+    def set_decorated(self, decorated):
+        super(BackgroundOutput, self).set_decorated(decorated)
+        self.output.set_decorated(decorated)
+
+    def set_formatter(self, formatter):
+        super(BackgroundOutput, self).set_formatter(formatter)
+        self.output.set_formatter(formatter)
+
+    def set_verbosity(self, level):
+        super(BackgroundOutput, self).set_verbosity(level)
+        self.output.set_verbosity(level)
+
+    def do_write(self, message, newline):
+        with self.__condition:
+            if self.__closed:
+                raise OutputError('Cannot write to a closed output')
+
+            self.raise_error()
+
+            if len(self.__queue) >= self.max_size:
+                if self.overflow == self.OVERFLOW_BLOCK:
+                    while len(self.__queue) >= self.max_size and self.__error is None:
+                        self.__condition.wait()
+                elif self.overflow == self.OVERFLOW_DROP_OLDEST:
+                    self.__queue.popleft()
+                    self.__unfinished -= 1
+                    self.dropped += 1
+                else:
+                    last_message, last_newline = self.__queue.pop()
+                    message = last_message + (os.linesep if last_newline else '') + message
+                    self.__unfinished -= 1
+
+            self.__queue.append((message, newline))
+            self.__unfinished += 1
+            self.__condition.notify_all()
+
+    def flush(self):
+        """
+        Waits until every queued message has been written.
+        """
+        with self.__condition:
+            while self.__unfinished and self.__error is None:
+                self.__condition.wait()
+
+            self.raise_error()
+
+    def close(self):
+        """
+        Flushes the queued messages and stops the writer thread.
+        """
+        with self.__condition:
+            if self.__closed:
+                return
+
+            self.__closed = True
+            self.__condition.notify_all()
+
+        self.__thread.join()
+
+        super(BackgroundOutput, self).close()
+
+    def run_writer(self):
+        while True:
+            with self.__condition:
+                while not self.__queue and not self.__closed:
+                    self.__condition.wait()
+
+                if not self.__queue:
+                    return
+
+                batch = list(self.__queue)
+                self.__queue.clear()
+                self.__condition.notify_all()
+
+            try:
+                self.output.do_write(''.join([message + (os.linesep if newline else '')
+                                              for message, newline in batch]), False)
+            except Exception, e:
+                with self.__condition:
+                    self.__error = e
+                    self.__unfinished = 0
+                    self.__queue.clear()
+                    self.__condition.notify_all()
+
+                return
+
+            with self.__condition:
+                self.__unfinished -= len(batch)
+                self.__condition.notify_all()
+
+    def raise_error(self):
+        if self.__error is not None:
+            raise self.__error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import os
+from output import Output
+
+
+class BufferedOutput(Output):
+    """
+    BufferedOutput keeps the written messages in memory.
+
+    Usage:
+    >>> output_ = BufferedOutput()
+    >>> output_.writeln('foo')
+    >>> output_.fetch()
+    'foo\\n'
+    """
+
+    def __init__(self, verbosity=Output.VERBOSITY_NORMAL, decorated=None, formatter=None):
+        self.__buffer = []
+
+        super(BufferedOutput, self).__init__(verbosity, decorated, formatter)
+
+    def fetch(self):
+        """
+        Empties the buffer and returns its content.
+
+        @return: The buffered output
+        @rtype: str
+        """
+        content = ''.join(self.__buffer)
+        self.__buffer = []
+
+        return content
+
+    def do_write(self, message, newline):
+        self.__buffer.append(message)
+
+        if newline:
+            self.__buffer.append(os.linesep)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+import os
+import errno
+import select
+
+from output import Output
+from stream_output import StreamOutput
+from ..terminal import Terminal
+
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+
+
+class FdOutput(StreamOutput):
+    """
+    FdOutput writes directly to a file descriptor, bypassing
+    the buffering and encoding layers of Python file objects.
+
+    Formatted chunks are queued and written with a single
+    os.writev() call (os.write() where writev is not available)
+    at the end of each write, or once buffer_size bytes are queued
+    when a buffer size is given. Queued chunks are written when
+    the output is closed, at the latest when the interpreter exits. Partial writes are resumed,
+    and non-blocking descriptors wait until they are writable again.
+
+    Usage:
+    >>> output_ = FdOutput(sys.stdout)
+    >>> output_.writeln(lines)
+    >>> output_.write_bytes(memoryview(data)[offset:])
+    """
+
+    def __init__(self, fd, verbosity=Output.VERBOSITY_NORMAL, decorated=None, formatter=None, buffer_size=0):
+        """
+        Constructor
+
+        @param fd: A file descriptor or an object with a fileno() method
+        @type fd: int or file
+        @param verbosity: The verbosity level
+        @type verbosity: int
+        @param decorated: Whether to decorate messages or not (None to auto-detect)
+        @type decorated: bool or None
+        @param formatter: An OutputFormatter instance
+        @type formatter: OutputFormatter
+        @param buffer_size: The number of bytes to queue before writing them (0 to write at the end of each write)
+        @type buffer_size: int
+        """
+        if hasattr(fd, 'fileno'):
+            if hasattr(fd, 'flush'):
+                fd.flush()
+
+            fd = fd.fileno()
+
+        self.fd = fd
+        self.buffer_size = int(buffer_size)
+
+        self.__chunks = []
+        self.__buffered = 0
+        self.__writing = False
+
+        super(FdOutput, self).__init__(fd, verbosity, decorated, formatter)
+
+        if self.buffer_size > 0:
+            self.close_at_exit()
+
+    def get_fd(self):
+        return self.fd
+
+    def write(self, messages, newline=False, output_type=Output.OUTPUT_NORMAL, verbosity=Output.VERBOSITY_NORMAL):
+        # the messages of a single write are queued and written together
+        self.__writing = True
+        try:
+            super(FdOutput, self).write(messages, newline, output_type, verbosity)
+        finally:
+            self.__writing = False
+
+        if self.__buffered > self.buffer_size:
+            self.flush()
+
+    def write_bytes(self, data):
+        """
+        Writes raw bytes without formatting or copying them.
+
+        @param data: The data to write
+        @type data: str or bytearray or memoryview
+        """
+        self.__chunks.append(data)
+        self.__buffered += len(data)
+
+        if self.__buffered > self.buffer_size:
+            self.flush()
+
+    def do_write(self, message, newline):
+        if isinstance(message, unicode):
+            message = message.encode('utf-8')
+
+        self.__chunks.append(message)
+        self.__buffered += len(message)
+
+        if newline:
+            self.__chunks.append(os.linesep)
+            self.__buffered += len(os.linesep)
+
+        # wrapping outputs call do_write() directly, outside of write()
+        if self.__buffered > self.buffer_size and (self.buffer_size > 0 or not self.__writing):
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the queued chunks to the file descriptor.
+        """
+        if not self.__chunks:
+            return
+
+        chunks, self.__chunks = self.__chunks, []
+        self.__buffered = 0
+
+        if not hasattr(os, 'writev'):
+            chunks = [memoryview(''.join([chunk.tobytes() if isinstance(chunk, memoryview) else str(chunk)
+                                          for chunk in chunks]))]
+
+        i = 0
+        while i < len(chunks):
+            try:
+                if len(chunks) - i == 1:
+                    written = os.write(self.fd, chunks[i])
+                else:
+                    written = os.writev(self.fd, chunks[i:i + IOV_MAX])
+            except OSError, e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    select.select([], [self.fd], [])
+
+                    continue
+                elif e.errno == errno.EINTR:
+                    continue
+
+                raise
+
+            # skip the chunks that have been fully written
+            # and keep the unwritten part of a partially written one
+            while i < len(chunks) and written >= len(chunks[i]):
+                written -= len(chunks[i])
+                i += 1
+
+            if written:
+                chunks[i] = memoryview(chunks[i])[written:]
+
+    def close(self):
+        """
+        Writes the queued chunks. The file descriptor is left open.
+        """
+        super(FdOutput, self).close()
+
+    def has_color_support(self, decorated):
+        return Terminal.has_color_support(self.fd)
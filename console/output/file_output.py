@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+import os
+import gzip
+import bz2
+
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+from output import Output, OutputError
+from stream_output import StreamOutput
+
+
+class FileOutput(StreamOutput):
+    """
+    FileOutput writes undecorated messages to a file,
+    optionally compressed with gzip, bz2 or lzma.
+
+    Messages are buffered in memory and written to the file
+    by large chunks. When max_bytes is set, the file is rotated
+    before it grows past that many (uncompressed) bytes:
+    run.log.gz becomes run.log.1.gz, run.log.1.gz becomes run.log.2.gz
+    and so on, up to backup_count files.
+
+    The compression is guessed from the file extension
+    (.gz, .bz2, .xz or .lzma) unless given explicitly.
+    The file is closed when the interpreter exits if it was not closed before.
+
+    Usage:
+    >>> output_ = FileOutput('run.log.gz', max_bytes=100 * 1024 * 1024, backup_count=5)
+    >>> output_.writeln('<info>foo</info>')
+    >>> output_.close()
+    """
+
+    COMPRESSION_NONE = None
+    COMPRESSION_GZIP = 'gzip'
+    COMPRESSION_BZ2 = 'bz2'
+    COMPRESSION_LZMA = 'lzma'
+
+    EXTENSIONS = {
+        '.gz': COMPRESSION_GZIP,
+        '.bz2': COMPRESSION_BZ2,
+        '.xz': COMPRESSION_LZMA,
+        '.lzma': COMPRESSION_LZMA
+    }
+
+    def __init__(self, path, verbosity=Output.VERBOSITY_NORMAL, formatter=None,
+                 compression=False, buffer_size=1024 * 1024, max_bytes=0, backup_count=0):
+        """
+        Constructor
+
+        @param path: The path of the file
+        @type path: str
+        @param verbosity: The verbosity level
+        @type verbosity: int
+        @param formatter: An OutputFormatter instance
+        @type formatter: OutputFormatter
+        @param compression: The compression to use (guessed from the path by default)
+        @type compression: str or None
+        @param buffer_size: The number of bytes to buffer before writing to the file
+        @type buffer_size: int
+        @param max_bytes: The number of bytes after which the file is rotated (0 to never rotate)
+        @type max_bytes: int
+        @param backup_count: The number of rotated files to keep
+        @type backup_count: int
+        """
+        if compression is False:
+            compression = self.EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+        if compression not in (self.COMPRESSION_NONE, self.COMPRESSION_GZIP,
+                               self.COMPRESSION_BZ2, self.COMPRESSION_LZMA):
+            raise OutputError('Unknown compression given (%s)' % compression)
+
+        if compression == self.COMPRESSION_LZMA and lzma is None:
+            raise OutputError('The lzma compression requires the lzma module (backports.lzma on Python 2)')
+
+        self.path = path
+        self.compression = compression
+        self.buffer_size = int(buffer_size)
+        self.max_bytes = int(max_bytes)
+        self.backup_count = int(backup_count)
+
+        self.__buffer = []
+        self.__buffered = 0
+        self.__written = 0
+        self.__closed = False
+
+        super(FileOutput, self).__init__(self.open(), verbosity, False, formatter)
+
+        self.close_at_exit()
+
+    def set_decorated(self, decorated):
+        pass
+
+    def get_path(self):
+        return self.path
+
+    def open(self):
+        """
+        Opens the file, truncating it.
+
+        @return: A file object
+        """
+        if self.compression == self.COMPRESSION_GZIP:
+            return gzip.open(self.path, 'wb')
+        elif self.compression == self.COMPRESSION_BZ2:
+            return bz2.BZ2File(self.path, 'wb')
+        elif self.compression == self.COMPRESSION_LZMA:
+            return lzma.LZMAFile(self.path, 'wb')
+
+        return open(self.path, 'wb')
+
+    def do_write(self, message, newline):
+        if isinstance(message, unicode):
+            message = message.encode('utf-8')
+
+        if newline:
+            message += os.linesep
+
+        size = self.__written + self.__buffered
+        if self.max_bytes and size and size + len(message) > self.max_bytes:
+            self.write_buffer()
+            self.rotate()
+
+        self.__buffer.append(message)
+        self.__buffered += len(message)
+
+        if self.__buffered >= self.buffer_size:
+            self.write_buffer()
+
+    def flush(self):
+        """
+        Writes the buffered messages to the file and flushes the compressor,
+        so that everything written so far can be decompressed.
+        """
+        if self.__closed:
+            return
+
+        self.write_buffer()
+
+        # BZ2File cannot be flushed
+        if hasattr(self.stream, 'flush'):
+            self.stream.flush()
+
+    def write_buffer(self):
+        """
+        Writes the buffered messages to the file.
+        """
+        if self.__buffer:
+            self.stream.write(''.join(self.__buffer))
+            self.__written += self.__buffered
+            self.__buffer = []
+            self.__buffered = 0
+
+    def rotate(self):
+        """
+        Closes the current file, shifts the backups and opens a new file.
+        """
+        self.stream.close()
+
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = self.get_rotated_path(i)
+                if os.path.exists(source):
+                    os.rename(source, self.get_rotated_path(i + 1))
+
+            os.rename(self.path, self.get_rotated_path(1))
+
+        self.stream = self.open()
+        self.__written = 0
+
+    def get_rotated_path(self, index):
+        base, extension = os.path.splitext(self.path)
+        if extension.lower() in self.EXTENSIONS:
+            return '%s.%d%s' % (base, index, extension)
+
+        return '%s.%d' % (self.path, index)
+
+    def close(self):
+        """
+        Writes the buffered messages and closes the file.
+        """
+        if self.__closed:
+            return
+
+        super(FileOutput, self).close()
+
+        self.stream.close()
+        self.__closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from output import Output
+from ..formatter.incremental_formatter import IncrementalFormatter
+
+
+class IncrementalOutput(Output):
+    """
+    IncrementalOutput formats the messages written to an output
+    as the successive chunks of a single text.
+
+    Tags can be opened by a write and closed by a later one,
+    which makes it possible to relay a large or streamed text
+    without buffering it.
+
+    Usage:
+    >>> output_ = IncrementalOutput(ConsoleOutput())
+    >>> for chunk in process.stdout:
+    ...     output_.write(chunk)
+    >>> output_.close()
+    """
+
+    def __init__(self, output_):
+        """
+        Constructor
+
+        @param output_: The output to write the formatted chunks to
+        @type output_: Output
+        """
+        self.output = output_
+
+        super(IncrementalOutput, self).__init__(output_.get_verbosity(),
+                                                output_.is_decorated(),
+                                                output_.get_formatter())
+
+        self.incremental = IncrementalFormatter(self.formatter)
+
+    def get_output(self):
+        return self.output
+
+    def set_decorated(self, decorated):
+        super(IncrementalOutput, self).set_decorated(decorated)
+        self.output.set_decorated(decorated)
+
+    def set_formatter(self, formatter):
+        super(IncrementalOutput, self).set_formatter(formatter)
+        self.output.set_formatter(formatter)
+
+        self.incremental = IncrementalFormatter(formatter)
+
+    def set_verbosity(self, level):
+        super(IncrementalOutput, self).set_verbosity(level)
+        self.output.set_verbosity(level)
+
+    def write(self, messages, newline=False, output_type=Output.OUTPUT_NORMAL, verbosity=Output.VERBOSITY_NORMAL):
+        if output_type != self.__class__.OUTPUT_NORMAL:
+            self.flush()
+
+            return self.output.write(messages, newline, output_type, verbosity)
+
+        # messages are formatted in do_write()
+        super(IncrementalOutput, self).write(messages, newline, self.__class__.OUTPUT_RAW, verbosity)
+
+    def do_write(self, message, newline):
+        text = self.incremental.format(message + (os.linesep if newline else ''))
+        if text:
+            self.output.do_write(text, False)
+
+    def flush(self):
+        """
+        Writes the pending incomplete tag, if any, as is, and flushes the output.
+        """
+        text = self.incremental.flush()
+        if text:
+            self.output.do_write(text, False)
+
+        self.output.flush()
+
+    def close(self):
+        """
+        Writes the pending text and forgets the opened tags.
+        """
+        self.flush()
+        self.incremental.reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
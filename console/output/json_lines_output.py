@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from output import Output
+from stream_output import StreamOutput
+
+
+class JsonLinesOutput(StreamOutput):
+    """
+    JsonLinesOutput writes records as JSON Lines for machine consumption.
+
+    Records are serialized directly, without going through the formatter,
+    and written to the stream in batches. Text messages are written
+    as {"message": ...} records, stripped of their style tags.
+    The remaining records are written when the output is closed,
+    at the latest when the interpreter exits. The stream is left open.
+
+    Usage:
+    >>> with JsonLinesOutput(sys.stdout) as output_:
+    ...     output_.write_record({'file': 'foo.txt', 'size': 1024})
+    """
+
+    def __init__(self, stream, verbosity=Output.VERBOSITY_NORMAL, formatter=None, batch_size=100):
+        """
+        Constructor
+
+        @param stream: The stream to write to
+        @type stream: file
+        @param verbosity: The verbosity level
+        @type verbosity: int
+        @param formatter: An OutputFormatter instance, used for text messages
+        @type formatter: OutputFormatter
+        @param batch_size: The number of records to buffer before writing them
+        @type batch_size: int
+        """
+        self.batch_size = max(1, int(batch_size))
+        self.__batch = []
+
+        super(JsonLinesOutput, self).__init__(stream, verbosity, False, formatter)
+
+        self.close_at_exit()
+
+    def set_decorated(self, decorated):
+        pass
+
+    def write_record(self, record, verbosity=Output.VERBOSITY_NORMAL):
+        """
+        Writes a record.
+
+        @param record: A JSON serializable record
+        @type record: dict
+        @param verbosity: The minimum verbosity required to write the record
+        @type verbosity: int
+        """
+        if verbosity > self.verbosity or self.verbosity == self.__class__.VERBOSITY_QUIET:
+            return
+
+        self.__batch.append(json.dumps(record))
+
+        if len(self.__batch) >= self.batch_size:
+            self.flush()
+
+    def write_records(self, records, verbosity=Output.VERBOSITY_NORMAL):
+        """
+        Writes several records.
+
+        @param records: An iterable of JSON serializable records
+        @type records: list
+        @param verbosity: The minimum verbosity required to write the records
+        @type verbosity: int
+        """
+        if verbosity > self.verbosity or self.verbosity == self.__class__.VERBOSITY_QUIET:
+            return
+
+        dumps = json.dumps
+        for record in records:
+            self.__batch.append(dumps(record))
+
+            if len(self.__batch) >= self.batch_size:
+                self.flush()
+
+    def do_write(self, message, newline):
+        self.write_record({'message': message})
+
+    def flush(self):
+        """
+        Writes the buffered records to the stream.
+        """
+        if not self.__batch:
+            return
+
+        self.__batch.append('')
+        self.stream.write('\n'.join(self.__batch))
+        self.stream.flush()
+        self.__batch = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
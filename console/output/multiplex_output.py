@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+from output import Output, OutputError
+
+
+class MultiplexOutput(Output):
+    """
+    MultiplexOutput writes every message to several outputs.
+
+    Each message is parsed once and rendered at most once per
+    decoration flag, however many outputs it is written to.
+    Every output keeps its own verbosity and decoration,
+    and its own way of writing and flushing.
+
+    Usage:
+    >>> output_ = MultiplexOutput([ConsoleOutput(), StreamOutput(open('run.log', 'a'), decorated=False)])
+    >>> output_.writeln('<info>foo</info>')
+    """
+
+    def __init__(self, outputs=None, formatter=None):
+        """
+        Constructor
+
+        @param outputs: The outputs to write to
+        @type outputs: list
+        @param formatter: The OutputFormatter instance used to parse messages
+        @type formatter: OutputFormatter
+        """
+        self.outputs = list(outputs or [])
+
+        super(MultiplexOutput, self).__init__(Output.VERBOSITY_NORMAL, False, formatter)
+
+    def add_output(self, output_):
+        self.outputs.append(output_)
+
+    def get_outputs(self):
+        return self.outputs
+
+    def set_verbosity(self, level):
+        for output_ in self.outputs:
+            output_.set_verbosity(level)
+
+    def get_verbosity(self):
+        if not self.outputs:
+            return Output.VERBOSITY_QUIET
+
+        return max([output_.get_verbosity() for output_ in self.outputs])
+
+    def write(self, messages, newline=False, output_type=Output.OUTPUT_NORMAL, verbosity=Output.VERBOSITY_NORMAL):
+        outputs = [output_ for output_ in self.outputs
+                   if output_.get_verbosity() != Output.VERBOSITY_QUIET and verbosity <= output_.get_verbosity()]
+        if not outputs:
+            return
+
+        if callable(messages):
+            messages = messages()
+
+        if not isinstance(messages, (list, tuple)):
+            messages = [messages]
+
+        for message in messages:
+            if callable(message):
+                message = message()
+
+            if output_type in (Output.OUTPUT_RAW, Output.OUTPUT_PLAIN):
+                if output_type == Output.OUTPUT_PLAIN:
+                    message = self.formatter.strip(message)
+
+                for output_ in outputs:
+                    output_.do_write(message, newline)
+
+                continue
+            elif output_type != Output.OUTPUT_NORMAL:
+                raise OutputError('Unknown output type given (%s)' % output_type)
+
+            segments = self.formatter.parse(message)
+            rendered = {}
+            for output_ in outputs:
+                decorated = output_.is_decorated()
+                if decorated not in rendered:
+                    rendered[decorated] = self.formatter.render(segments, decorated)
+
+                output_.do_write(rendered[decorated], newline)
+
+    def do_write(self, message, newline):
+        for output_ in self.outputs:
+            output_.do_write(message, newline)
+
+    def flush(self):
+        for output_ in self.outputs:
+            output_.flush()
+
+    def close(self):
+        super(MultiplexOutput, self).close()
+
+        for output_ in self.outputs:
+            output_.close()
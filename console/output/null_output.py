@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+from output import Output
+
+
+class NullOutput(Output):
+    """
+    NullOutput suppresses all output.
+
+    Messages are discarded before being evaluated or formatted.
+
+    Usage:
+    >>> output_ = NullOutput()
+    """
+
+    def __init__(self, verbosity=Output.VERBOSITY_QUIET, decorated=None, formatter=None):
+        super(NullOutput, self).__init__(Output.VERBOSITY_QUIET, False, formatter)
+
+    def set_decorated(self, decorated):
+        pass
+
+    def is_decorated(self):
+        return False
+
+    def set_verbosity(self, level):
+        pass
+
+    def get_verbosity(self):
+        return Output.VERBOSITY_QUIET
+
+    def write(self, messages, newline=False, output_type=Output.OUTPUT_NORMAL, verbosity=Output.VERBOSITY_NORMAL):
+        pass
+
+    def writeln(self, messages, output_type=Output.OUTPUT_NORMAL, verbosity=Output.VERBOSITY_NORMAL):
+        pass
+
+    def do_write(self, message, newline):
+        pass
@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import atexit
+import threading
+import traceback
+
 from ..formatter.output_formatter import OutputFormatter
 
 
@@ -12,13 +16,19 @@ class Output(object):
     VERBOSITY_QUIET = 0
     VERBOSITY_NORMAL = 1
     VERBOSITY_VERBOSE = 2
+    VERBOSITY_VERY_VERBOSE = 3
+    VERBOSITY_DEBUG = 4
 
     OUTPUT_NORMAL = 0
     OUTPUT_RAW = 1
     OUTPUT_PLAIN = 2
 
+    # outputs to close when the interpreter exits
+    __closed_at_exit = []
+    __closed_at_exit_lock = threading.Lock()
+
     def __init__(self, verbosity=VERBOSITY_NORMAL, decorated=None, formatter=None):
-        self.verbosity = verbosity or self.__class__.VERBOSITY_NORMAL
+        self.verbosity = self.__class__.VERBOSITY_NORMAL if verbosity is None else verbosity
         self.formatter = formatter or OutputFormatter()
         self.formatter.set_decorated(bool(decorated))
 
@@ -40,27 +50,105 @@ class Output(object):
     def get_verbosity(self):
         return self.verbosity
 
-    def write(self, messages, newline=False, output_type=OUTPUT_NORMAL):
-        if self.verbosity == self.__class__.VERBOSITY_QUIET:
+    def is_quiet(self):
+        return self.get_verbosity() == self.__class__.VERBOSITY_QUIET
+
+    def is_verbose(self):
+        return self.get_verbosity() >= self.__class__.VERBOSITY_VERBOSE
+
+    def is_very_verbose(self):
+        return self.get_verbosity() >= self.__class__.VERBOSITY_VERY_VERBOSE
+
+    def is_debug(self):
+        return self.get_verbosity() >= self.__class__.VERBOSITY_DEBUG
+
+    def write(self, messages, newline=False, output_type=OUTPUT_NORMAL, verbosity=VERBOSITY_NORMAL):
+        """
+        Writes a message to the output.
+
+        Nothing is evaluated or formatted if the output verbosity
+        is lower than the verbosity required by the message.
+
+        @param messages: The message as a list of lines, a single string
+                         or a callable returning one of those
+        @type messages: str or list or callable
+        @param newline: Whether to add a newline or not
+        @type newline: bool
+        @param output_type: The type of output
+        @type output_type: int
+        @param verbosity: The minimum verbosity required to display the message
+        @type verbosity: int
+        """
+        if verbosity > self.verbosity or self.verbosity == self.__class__.VERBOSITY_QUIET:
             return
 
+        if callable(messages):
+            messages = messages()
+
         if not isinstance(messages, (list, tuple)):
             messages = [messages]
 
-        for message in messages:
-            if output_type == self.__class__.OUTPUT_NORMAL:
-                message = self.formatter.format(message)
-            elif output_type == self.__class__.OUTPUT_RAW:
-                pass
-            elif output_type == self.__class__.OUTPUT_PLAIN:
-                message = self.formatter.format(message)
-            else:
-                raise OutputError('Unknown output type given (%s)' % output_type)
+        messages = [message() if callable(message) else message for message in messages]
+
+        if output_type == self.__class__.OUTPUT_NORMAL:
+            messages = self.formatter.format_many(messages)
+        elif output_type == self.__class__.OUTPUT_RAW:
+            pass
+        elif output_type == self.__class__.OUTPUT_PLAIN:
+            messages = [self.formatter.strip(message) for message in messages]
+        else:
+            raise OutputError('Unknown output type given (%s)' % output_type)
 
+        for message in messages:
             self.do_write(message, newline)
 
-    def writeln(self, messages, output_type=OUTPUT_NORMAL):
-        self.write(messages, True, output_type)
+    def writeln(self, messages, output_type=OUTPUT_NORMAL, verbosity=VERBOSITY_NORMAL):
+        self.write(messages, True, output_type, verbosity)
 
     def do_write(self, message, newline):
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
+
+    def flush(self):
+        """
+        Writes the messages buffered by the output, if any.
+        """
+        pass
+
+    def close(self):
+        """
+        Flushes the output and releases its resources.
+
+        Nothing should be written to the output afterwards.
+        """
+        with Output.__closed_at_exit_lock:
+            if self in Output.__closed_at_exit:
+                Output.__closed_at_exit.remove(self)
+
+        self.flush()
+
+    def close_at_exit(self):
+        """
+        Closes the output when the interpreter exits, unless it was closed before.
+
+        Buffering outputs register themselves, so that exiting,
+        for instance from Application.run(), does not lose their messages.
+        """
+        with Output.__closed_at_exit_lock:
+            Output.__closed_at_exit.append(self)
+
+    @classmethod
+    def close_all(cls):
+        """
+        Closes the outputs registered to be closed at exit, the last registered first.
+        """
+        with Output.__closed_at_exit_lock:
+            outputs = Output.__closed_at_exit[::-1]
+
+        for output_ in outputs:
+            try:
+                output_.close()
+            except Exception:
+                traceback.print_exc()
+
+
+atexit.register(Output.close_all)
@@ -2,6 +2,7 @@
 
 import os
 from output import Output
+from ..terminal import Terminal
 
 
 class StreamOutput(Output):
@@ -22,10 +23,4 @@ class StreamOutput(Output):
         self.stream.flush()
 
     def has_color_support(self, decorated):
-        if os.pathsep == '\\':
-            return os.getenv('ANSICON') is not None
-
-        if not hasattr(self.stream, 'fileno'):
-            return False
-
-        return os.isatty(self.stream.fileno())
+        return Terminal.has_color_support(self.stream)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+
+from output import Output
+
+
+class ThreadSafeOutput(Output):
+    """
+    ThreadSafeOutput lets several threads write to the same output.
+
+    Each thread buffers its formatted messages until a line is complete.
+    Complete lines are then written to the underlying output under a lock,
+    so lines from different threads never interleave. Messages containing
+    a carriage return, such as progress bar redraws, are written right away,
+    and flushing writes the incomplete line of the calling thread, for
+    instance a prompt. Closing writes the incomplete lines of all the threads.
+
+    Usage:
+    >>> output_ = ThreadSafeOutput(ConsoleOutput())
+    >>> output_.write('<info>Worker %d:</info> ' % worker)
+    >>> output_.writeln('done')
+    """
+
+    def __init__(self, output_):
+        """
+        Constructor
+
+        @param output_: The output to write complete lines to
+        @type output_: Output
+        """
+        self.output = output_
+
+        self.__lock = threading.RLock()
+        self.__local = threading.local()
+        # the incomplete line of each thread, to write when closing
+        self.__pending = {}
+
+        super(ThreadSafeOutput, self).__init__(output_.get_verbosity(),
+                                               output_.is_decorated(),
+                                               output_.get_formatter())
+
+    def get_output(self):
+        return self.output
+
+    def set_decorated(self, decorated):
+        super(ThreadSafeOutput, self).set_decorated(decorated)
+        self.output.set_decorated(decorated)
+
+    def set_formatter(self, formatter):
+        super(ThreadSafeOutput, self).set_formatter(formatter)
+        self.output.set_formatter(formatter)
+
+    def set_verbosity(self, level):
+        super(ThreadSafeOutput, self).set_verbosity(level)
+        self.output.set_verbosity(level)
+
+    def do_write(self, message, newline):
+        pending = self.get_pending()
+        pending.append(message)
+
+        if newline:
+            pending.append(os.linesep)
+        elif '\r' in message:
+            # a line being redrawn is never completed
+            self.flush_pending(pending)
+
+            return
+        elif '\n' not in message:
+            return
+
+        text = ''.join(pending)
+        pos = text.rfind('\n') + 1
+        del pending[:]
+        if pos < len(text):
+            pending.append(text[pos:])
+
+        with self.__lock:
+            self.output.do_write(text[:pos], False)
+
+    def get_pending(self):
+        """
+        Returns the incomplete line of the current thread.
+
+        @return: The messages of the line
+        @rtype: list
+        """
+        try:
+            return self.__local.pending
+        except AttributeError:
+            pending = self.__local.pending = []
+
+            with self.__lock:
+                # forget the threads that have exited, writing what they left
+                for thread, messages in self.__pending.items():
+                    if not thread.is_alive():
+                        del self.__pending[thread]
+                        self.flush_pending(messages)
+
+                self.__pending[threading.current_thread()] = pending
+
+            return pending
+
+    def flush_pending(self, pending):
+        if pending:
+            text = ''.join(pending)
+            del pending[:]
+
+            with self.__lock:
+                self.output.do_write(text, False)
+
+    def flush(self):
+        """
+        Writes the incomplete line of the current thread, if any,
+        and flushes the underlying output.
+        """
+        self.flush_pending(getattr(self.__local, 'pending', None))
+
+        with self.__lock:
+            self.output.flush()
+
+    def close(self):
+        """
+        Writes the incomplete lines of all the threads
+        and closes the underlying output.
+        """
+        with self.__lock:
+            for pending in self.__pending.values():
+                self.flush_pending(pending)
+
+            self.__pending = {}
+
+        super(ThreadSafeOutput, self).close()
+        self.output.close()
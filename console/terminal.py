@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+import os
+import signal
+import struct
+
+
+class Terminal(object):
+    """
+    Terminal detects the capabilities of the terminal.
+
+    Detection is done once per process and cached. The size
+    of the terminal is detected again after a SIGWINCH signal.
+    """
+
+    COLORS_BASIC = 8
+    COLORS_256 = 256
+    COLORS_TRUECOLOR = 16777216
+
+    DEFAULT_SIZE = (80, 24)
+
+    # only the standard streams are cached, other descriptors may be reused
+    STANDARD_FDS = (0, 1, 2)
+
+    __color_depth = None
+    __size = None
+    __ttys = {}
+    __stty = None
+    __winch_handler_installed = False
+
+    @classmethod
+    def get_fd(cls, stream):
+        """
+        Returns the file descriptor of a stream.
+
+        @param stream: A stream or a file descriptor
+        @type stream: file or int
+
+        @return: The file descriptor or None if the stream has none
+        @rtype: int or None
+        """
+        if isinstance(stream, (int, long)):
+            return stream
+
+        try:
+            return stream.fileno()
+        except (AttributeError, IOError, ValueError):
+            return None
+
+    @classmethod
+    def is_tty(cls, stream):
+        """
+        Returns whether a stream is a terminal.
+
+        @param stream: A stream or a file descriptor
+        @type stream: file or int
+
+        @rtype: bool
+        """
+        fd = cls.get_fd(stream)
+        if fd is None:
+            return False
+
+        tty = cls.__ttys.get(fd)
+        if tty is None:
+            try:
+                tty = os.isatty(fd)
+            except OSError:
+                tty = False
+
+            if fd in cls.STANDARD_FDS:
+                cls.__ttys[fd] = tty
+
+        return tty
+
+    @classmethod
+    def has_color_support(cls, stream):
+        """
+        Returns whether a stream supports escape sequences.
+
+        @param stream: A stream or a file descriptor
+        @type stream: file or int
+
+        @rtype: bool
+        """
+        if os.sep == '\\':
+            return os.getenv('ANSICON') is not None
+
+        return cls.is_tty(stream)
+
+    @classmethod
+    def get_size(cls):
+        """
+        Returns the size of the terminal.
+
+        The COLUMNS and LINES environment variables take precedence,
+        then the size of the terminal the standard streams are attached to.
+
+        @return: A (columns, rows) tuple
+        @rtype: tuple
+        """
+        size = cls.__size
+        if size is None:
+            cls.install_winch_handler()
+            size = cls.__size = cls.detect_size()
+
+        return size
+
+    @classmethod
+    def get_columns(cls):
+        """
+        Returns the number of columns of the terminal.
+
+        @rtype: int
+        """
+        return cls.get_size()[0]
+
+    @classmethod
+    def get_rows(cls):
+        """
+        Returns the number of rows of the terminal.
+
+        @rtype: int
+        """
+        return cls.get_size()[1]
+
+    @classmethod
+    def set_size(cls, columns, rows):
+        """
+        Overrides the detected size of the terminal, until the next SIGWINCH.
+
+        @type columns: int
+        @type rows: int
+        """
+        cls.__size = (int(columns), int(rows))
+
+    @classmethod
+    def detect_size(cls, environ=None):
+        """
+        Detects the size of the terminal.
+
+        @param environ: The environment variables (defaults to os.environ)
+        @type environ: dict
+
+        @return: A (columns, rows) tuple
+        @rtype: tuple
+        """
+        if environ is None:
+            environ = os.environ
+
+        columns, rows = 0, 0
+        try:
+            columns = int(environ.get('COLUMNS', 0))
+            rows = int(environ.get('LINES', 0))
+        except ValueError:
+            pass
+
+        if columns <= 0 or rows <= 0:
+            for fd in (1, 2, 0):
+                size = cls.query_size(fd)
+                if size is not None:
+                    columns = columns if columns > 0 else size[0]
+                    rows = rows if rows > 0 else size[1]
+                    break
+
+        return (columns if columns > 0 else cls.DEFAULT_SIZE[0],
+                rows if rows > 0 else cls.DEFAULT_SIZE[1])
+
+    @classmethod
+    def query_size(cls, fd):
+        """
+        Asks a terminal for its size.
+
+        @param fd: The file descriptor of the terminal
+        @type fd: int
+
+        @return: A (columns, rows) tuple or None
+        @rtype: tuple or None
+        """
+        try:
+            import fcntl
+            import termios
+
+            rows, columns = struct.unpack('hh', fcntl.ioctl(fd, termios.TIOCGWINSZ, '\0' * 4))
+        except Exception:
+            return None
+
+        if columns <= 0 or rows <= 0:
+            return None
+
+        return columns, rows
+
+    @classmethod
+    def install_winch_handler(cls):
+        """
+        Forgets the size of the terminal when it is resized.
+
+        Signal handlers can only be installed from the main thread,
+        the size is not refreshed if detected first from another thread.
+        System calls interrupted by the signal are restarted, so that
+        resizing the terminal does not make them fail with EINTR.
+        """
+        if cls.__winch_handler_installed or not hasattr(signal, 'SIGWINCH'):
+            return
+
+        previous = signal.getsignal(signal.SIGWINCH)
+
+        def handle_winch(signum, frame):
+            cls.__size = None
+
+            if callable(previous):
+                previous(signum, frame)
+
+        try:
+            signal.signal(signal.SIGWINCH, handle_winch)
+            signal.siginterrupt(signal.SIGWINCH, False)
+        except ValueError:
+            # not the main thread
+            return
+
+        cls.__winch_handler_installed = True
+
+    @classmethod
+    def has_stty(cls):
+        """
+        Returns whether the stty command is available.
+
+        @rtype: bool
+        """
+        if cls.__stty is None:
+            cls.__stty = os.system('stty > %s 2>&1' % os.devnull) == 0
+
+        return cls.__stty
+
+    @classmethod
+    def refresh(cls):
+        """
+        Forgets everything that was detected.
+        """
+        cls.__color_depth = None
+        cls.__size = None
+        cls.__ttys.clear()
+        cls.__stty = None
+
+    @classmethod
+    def get_color_depth(cls):
+        """
+        Returns the number of colors supported by the terminal.
+
+        @rtype: int
+        """
+        if cls.__color_depth is None:
+            cls.__color_depth = cls.detect_color_depth()
+
+        return cls.__color_depth
+
+    @classmethod
+    def set_color_depth(cls, depth):
+        """
+        Overrides the detected number of colors, None to detect it again.
+
+        @param depth: The number of colors
+        @type depth: int or None
+        """
+        cls.__color_depth = depth
+
+    @classmethod
+    def detect_color_depth(cls, environ=None):
+        """
+        Detects the number of colors supported by the terminal
+        from the COLORTERM and TERM environment variables,
+        falling back on terminfo.
+
+        @param environ: The environment variables (defaults to os.environ)
+        @type environ: dict
+
+        @rtype: int
+        """
+        if environ is None:
+            environ = os.environ
+
+        if environ.get('COLORTERM', '').lower() in ('truecolor', '24bit'):
+            return cls.COLORS_TRUECOLOR
+
+        term = environ.get('TERM', '').lower()
+        if term.endswith('-direct') or term.endswith('-truecolor'):
+            return cls.COLORS_TRUECOLOR
+
+        if '256color' in term:
+            return cls.COLORS_256
+
+        if term and term != 'dumb':
+            try:
+                import curses
+
+                with open(os.devnull, 'w') as null:
+                    curses.setupterm(term, null.fileno())
+
+                if curses.tigetnum('colors') >= 256:
+                    return cls.COLORS_256
+            except Exception:
+                pass
+
+        return cls.COLORS_BASIC
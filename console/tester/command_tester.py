@@ -1,9 +1,7 @@
 # -*- coding: utf-8 -*-
 
-import StringIO
-
 from ..input.list_input import ListInput
-from ..output.stream_output import StreamOutput
+from ..output.buffered_output import BufferedOutput
 
 
 class CommandTester(object):
@@ -21,6 +19,7 @@ class CommandTester(object):
         self.__command = command
         self.__input = None
         self.__output = None
+        self.__display = ''
 
     def execute(self, input_, options=None):
         """
@@ -45,7 +44,8 @@ class CommandTester(object):
         if 'interactive' in options:
             self.__input.set_interactive(options['interactive'])
 
-        self.__output = StreamOutput(StringIO.StringIO())
+        self.__output = BufferedOutput()
+        self.__display = ''
         if 'decorated' in options:
             self.__output.set_decorated(options['decorated'])
         if 'verbosity' in options:
@@ -60,9 +60,9 @@ class CommandTester(object):
         @return: The display
         @rtype: str
         """
-        self.__output.get_stream().seek(0)
+        self.__display += self.__output.fetch()
 
-        return self.__output.get_stream().read()
+        return self.__display
 
     def get_input(self):
         """
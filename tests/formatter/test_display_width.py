@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+from console.formatter.display_width import DisplayWidth
+from console.formatter.output_formatter import OutputFormatter
+
+
+class DisplayWidthTest(TestCase):
+
+    def test_get_width(self):
+        """
+        DisplayWidth.get_width() returns the number of columns of a text
+        """
+        self.assertEqual(3, DisplayWidth.get_width('foo'))
+        self.assertEqual(3, DisplayWidth.get_width('\033[32;1mfoo\033[0m'),
+                         msg='.get_width() ignores escape sequences')
+        self.assertEqual(6, DisplayWidth.get_width(u'日本語'))
+        self.assertEqual(6, DisplayWidth.get_width('日本語'),
+                         msg='.get_width() decodes utf-8 strings')
+        self.assertEqual(4, DisplayWidth.get_width(u'ｆｏ'))
+        self.assertEqual(4, DisplayWidth.get_width(u'café'))
+        self.assertEqual(4, DisplayWidth.get_width(u'cafe\u0301'),
+                         msg='.get_width() ignores combining characters')
+        self.assertEqual(31, DisplayWidth.get_width('<info>foo</info> <foo>bar</foo>'))
+        self.assertEqual(18, DisplayWidth.get_width('<info>foo</info> <foo>bar</foo>', OutputFormatter(True)),
+                         msg='.get_width() strips the style tags known by the formatter')
+
+    def test_pad(self):
+        """
+        DisplayWidth.pad() pads texts to a number of columns
+        """
+        self.assertEqual('foo  ', DisplayWidth.pad('foo', 5))
+        self.assertEqual(u'日本  ', DisplayWidth.pad(u'日本', 6))
+        self.assertEqual('foobar', DisplayWidth.pad('foobar', 3))
+        self.assertEqual('<info>foo</info>  ', DisplayWidth.pad('<info>foo</info>', 5, OutputFormatter()))
+
+    def test_wrap(self):
+        """
+        DisplayWidth.wrap() wraps texts on word boundaries
+        """
+        self.assertEqual(['the quick', 'brown fox', 'jumps'], DisplayWidth.wrap('the quick brown fox jumps', 10))
+        self.assertEqual(['foo', 'bar baz'], DisplayWidth.wrap('foo\nbar baz', 10))
+        self.assertEqual(['abcd', 'efgh', 'ij k'], DisplayWidth.wrap('abcdefghij k', 4))
+        self.assertEqual([u'日本', u'語 a'], DisplayWidth.wrap(u'日本語 a', 5))
+        self.assertEqual(['日本', '語'], DisplayWidth.wrap('日本語', 4))
+        self.assertEqual([''], DisplayWidth.wrap('', 4))
+        self.assertRaises(ValueError, DisplayWidth.wrap, 'foo', 0)
+
+    def test_wrap_markup(self):
+        """
+        DisplayWidth.wrap() never splits escape sequences and style tags
+        """
+        formatter = OutputFormatter(True)
+
+        self.assertEqual(['\033[32mabcd', 'efgh\033[0m'], DisplayWidth.wrap('\033[32mabcdefgh\033[0m', 4))
+        self.assertEqual(['<info>abcd</>', '<info>efgh</info>'],
+                         DisplayWidth.wrap('<info>abcdefgh</info>', 4, formatter),
+                         msg='.wrap() closes and opens again the tags spanning several lines')
+        self.assertEqual(['<info>foo bar</info>', '<comment>baz <fg=red>qux</></>', '<comment>quux</comment>'],
+                         DisplayWidth.wrap('<info>foo bar</info> <comment>baz <fg=red>qux</> quux</comment>', 7,
+                                           formatter))
+        self.assertEqual(['\\<inf', 'o> a'], DisplayWidth.wrap('\\<info> a', 4, formatter),
+                         msg='.wrap() counts escaped "<" as a single column')
+        self.assertEqual(['<foo', '>'], DisplayWidth.wrap('<foo>', 4, formatter),
+                         msg='.wrap() splits unknown tags as text')
+        self.assertEqual(['\033[32mabcd\033[0m', '\033[32mefgh\033[0m'],
+                         [formatter.format(line) for line in DisplayWidth.wrap('<info>abcdefgh</info>', 4, formatter)])
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+from console.formatter.output_formatter import OutputFormatter
+from console.formatter.incremental_formatter import IncrementalFormatter
+
+
+class IncrementalFormatterTest(TestCase):
+
+    def test_format(self):
+        """
+        IncrementalFormatter.format() keeps the opened tags between chunks
+        """
+        incremental = IncrementalFormatter(OutputFormatter(True))
+
+        self.assertEqual('\033[32mfoo\033[0m', incremental.format('<info>foo'))
+        self.assertEqual('\033[32mbar\033[0mbaz', incremental.format('bar</info>baz'))
+        self.assertEqual('', incremental.flush())
+
+    def test_format_split_tags(self):
+        """
+        IncrementalFormatter.format() waits for the end of incomplete tags
+        """
+        incremental = IncrementalFormatter(OutputFormatter(True))
+
+        self.assertEqual('a', incremental.format('a<in'))
+        self.assertEqual('', incremental.format('fo'))
+        self.assertEqual('\033[32mb\033[0m', incremental.format('>b</'))
+        self.assertEqual('c', incremental.format('>c\\'))
+        self.assertEqual('<info>', incremental.format('<info>'))
+        self.assertEqual('d < e', incremental.format('d < e'))
+        self.assertEqual('<fo', incremental.format('<fo') + incremental.flush())
+
+    def test_format_chunks(self):
+        """
+        IncrementalFormatter gives the same result whatever the chunks are
+        """
+        formatter = OutputFormatter(False)
+        message = 'foo <info>bar \\<baz> <comment>qux</comment></info> <fg=red;options=bold>quux</>'
+
+        for size in range(1, len(message) + 1):
+            incremental = IncrementalFormatter(formatter)
+            chunks = [message[i:i + size] for i in range(0, len(message), size)]
+
+            self.assertEqual(formatter.format(message),
+                             ''.join([incremental.format(chunk) for chunk in chunks]) + incremental.flush())
+
+    def test_reset(self):
+        """
+        IncrementalFormatter.reset() forgets the opened tags
+        """
+        incremental = IncrementalFormatter(OutputFormatter(True))
+        incremental.format('<info>foo<comm')
+        incremental.reset()
+
+        self.assertEqual('bar', incremental.format('bar'))
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+from console.formatter.output_formatter import OutputFormatter
+from console.formatter.output_formatter_style import OutputFormatterStyle
+from console.terminal import Terminal
+
+
+class OutputFormatterTest(TestCase):
+
+    def test_format(self):
+        """
+        OutputFormatter.format() applies the styles of the tags
+        """
+        formatter = OutputFormatter(True)
+
+        self.assertEqual('\033[32mfoo\033[0m', formatter.format('<info>foo</info>'))
+        self.assertEqual('\033[37;41msome error\033[0m', formatter.format('<error>some error</error>'))
+        self.assertEqual('foo \033[33mbar\033[0m baz', formatter.format('foo <comment>bar</comment> baz'))
+        self.assertEqual('\033[32m<info>foo\033[0m', formatter.format('<info>\\<info>foo</info>'))
+        self.assertEqual('<foo>bar', formatter.format('<foo>bar'))
+
+    def test_format_undecorated(self):
+        """
+        OutputFormatter.format() removes the tags when not decorated
+        """
+        formatter = OutputFormatter(False)
+
+        self.assertEqual('foo bar', formatter.format('<info>foo</info> <comment>bar</comment>'))
+        self.assertEqual('<info>foo', formatter.format('\\<info>foo'))
+
+    def test_cache(self):
+        """
+        OutputFormatter caches compiled messages
+        """
+        formatter = OutputFormatter(True)
+
+        for i in range(3):
+            self.assertEqual('\033[32mfoo\033[0m', formatter.format('<info>foo</info>'))
+
+        info = formatter.get_cache_info()
+        self.assertEqual(2, info['hits'])
+        self.assertEqual(1, info['misses'])
+        self.assertEqual(1, info['size'])
+
+        formatter.set_style('info', OutputFormatterStyle('blue'))
+        self.assertEqual('\033[34mfoo\033[0m', formatter.format('<info>foo</info>'),
+                         msg='.set_style() invalidates the cache')
+
+        formatter.get_style('info').set_foreground('red')
+        self.assertEqual('\033[31mfoo\033[0m', formatter.format('<info>foo</info>'),
+                         msg='changing a style in place invalidates the cache')
+        formatter.get_style('info').set_option('bold')
+        self.assertEqual('\033[31;1mfoo\033[0m', formatter.format('<info>foo</info>'),
+                         msg='changing a style in place invalidates the cache')
+
+        formatter.set_decorated(False)
+        self.assertEqual('foo', formatter.format('<info>foo</info>'))
+
+    def test_format_edge_cases(self):
+        """
+        OutputFormatter.format() handles stray, escaped and unknown tags
+        """
+        formatter = OutputFormatter(True)
+
+        self.assertEqual('\033[32ma \033[0m< b', formatter.format('<info>a < b</info>'))
+        self.assertEqual('\033[32ma\033[0m<html>', formatter.format('<info>a</>\\<html>'))
+        self.assertEqual('<>foo', formatter.format('<>foo'))
+        self.assertEqual('<div class="a">text</div>', formatter.format('<div class="a">text</div>'))
+        self.assertEqual('x' * 100000, formatter.format('x' * 100000))
+        self.assertEqual('<' * 100000, formatter.format('<' * 100000))
+
+    def test_format_nested_styles(self):
+        """
+        OutputFormatter.format() only emits the needed style transitions
+        """
+        formatter = OutputFormatter(True)
+        formatter.set_style('bold', OutputFormatterStyle(None, None, ['bold']))
+        formatter.set_style('alert', OutputFormatterStyle('green', None, ['bold']))
+
+        self.assertEqual('\033[32ma\033[33mb\033[32mc\033[0m',
+                         formatter.format('<info>a<comment>b</comment>c</info>'))
+        self.assertEqual('\033[32mab\033[0m', formatter.format('<info>a</info><info>b</info>'))
+        self.assertEqual('\033[32ma\033[1mb\033[0m', formatter.format('<info>a</info><alert>b</alert>'))
+        self.assertEqual('\033[1ma\033[0;32mb\033[0m', formatter.format('<bold>a</bold><info>b</info>'))
+        self.assertEqual('\033[32;1ma\033[22mb\033[0m', formatter.format('<alert>a</alert><info>b</info>'))
+        self.assertEqual('\033[37;41ma\033[0m b', formatter.format('<error>a</error> b'))
+        self.assertEqual('\033[32mab\033[0mc', formatter.format('<info>a<fg=green>b</info>c'),
+                         msg='closing tags pop their own style before an equal one')
+        self.assertEqual('\033[32mabc\033[0md', formatter.format('<info>a<fg=green>b</fg=green>c</info>d'))
+
+    def test_format_inline_styles(self):
+        """
+        OutputFormatter.format() supports inline styles
+        """
+        formatter = OutputFormatter(True)
+
+        try:
+            OutputFormatterStyle.color_depth = Terminal.COLORS_256
+            self.assertEqual('\033[38;5;208;44mfoo\033[0m', formatter.format('<fg=#ff8800;bg=blue>foo</>'))
+            self.assertEqual('\033[31mfoo\033[0m', formatter.format('<fg=red>foo</>'))
+            self.assertEqual('<fg=orange>foo', formatter.format('<fg=orange>foo'))
+        finally:
+            OutputFormatterStyle.color_depth = None
+
+    def test_create_style_from_string(self):
+        """
+        OutputFormatter.create_style_from_string() parses and caches inline styles
+        """
+        formatter = OutputFormatter(True)
+
+        style = formatter.create_style_from_string('fg=red;bg=blue;options=bold,underscore')
+        self.assertEqual('\033[31;44;1;4mfoo\033[0m', style.apply('foo'))
+        self.assertTrue(style is formatter.create_style_from_string('fg=red;bg=blue;options=bold,underscore'))
+
+        self.assertFalse(formatter.create_style_from_string('fg=red;foo'))
+        self.assertFalse(formatter.create_style_from_string('fg=red;foo=bar'))
+        self.assertFalse(formatter.create_style_from_string('options=bold,italic'))
+
+        self.assertEqual('\033[31;1ma\033[0;32mb\033[0m',
+                         formatter.format('<fg=red;options=bold>a</fg=red;options=bold><info>b</info>'))
+        self.assertEqual('\033[32ma\033[33mb\033[0mc',
+                         formatter.format('<info>a<comment>b</info>c'))
+
+    def test_strip(self):
+        """
+        OutputFormatter.strip() removes style tags and unescapes the message
+        """
+        formatter = OutputFormatter(True)
+
+        self.assertEqual('foo bar', formatter.strip('<info>foo</info> <fg=red;options=bold>bar</>'))
+        self.assertEqual('<foo>bar</foo> <info> <>', formatter.strip('<foo>bar</foo> \\<info> <>'))
+        self.assertEqual('foo', formatter.strip('foo'))
+
+    def test_escape(self):
+        """
+        OutputFormatter.escape() escapes texts so that they are formatted as is
+        """
+        formatter = OutputFormatter(True)
+
+        for text in ['<info>foo</info>', 'a < b', '\\<info>', '<<>>']:
+            self.assertEqual(text, formatter.format(OutputFormatter.escape(text)))
+            self.assertEqual(text, OutputFormatter.unescape(OutputFormatter.escape(text)))
+
+        self.assertEqual(['\\<a>', 'b'], OutputFormatter.escape(['<a>', 'b']))
+
+    def test_format_many(self):
+        """
+        OutputFormatter.format_many() formats lists and iterators of messages
+        """
+        formatter = OutputFormatter(True)
+        messages = ['<info>foo</info>', 'bar', '<comment>baz</comment>']
+        expected = ['\033[32mfoo\033[0m', 'bar', '\033[33mbaz\033[0m']
+
+        self.assertEqual(expected, formatter.format_many(messages))
+        self.assertEqual(expected, formatter.format_many(tuple(messages)))
+
+        formatted = formatter.format_many(iter(messages))
+        self.assertFalse(isinstance(formatted, list))
+        self.assertEqual(expected, list(formatted))
+
+    def test_format_unbalanced_tags(self):
+        """
+        OutputFormatter.format() does not leak styles from one message to the next
+        """
+        formatter = OutputFormatter(True)
+
+        self.assertEqual('\033[32mfoo\033[0m', formatter.format('<info>foo'))
+        self.assertEqual('bar', formatter.format('bar'))
+        self.assertEqual('baz', formatter.format('baz</info>'))
+        self.assertRaises(ValueError, formatter.format, '<info>foo</comment>')
+        self.assertEqual(['bar'], formatter.format_many(['bar']))
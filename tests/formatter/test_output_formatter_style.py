@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+from console.formatter.output_formatter_style import OutputFormatterStyle
+from console.terminal import Terminal
+
+
+class OutputFormatterStyleTest(TestCase):
+
+    def test_apply(self):
+        """
+        OutputFormatterStyle.apply() wraps the text in the style sequences
+        """
+        self.assertEqual('\033[32;40;1mfoo\033[0m', OutputFormatterStyle('green', 'black', ['bold']).apply('foo'))
+        self.assertEqual('foo', OutputFormatterStyle().apply('foo'))
+
+    def test_apply_after_changes(self):
+        """
+        OutputFormatterStyle.apply() reflects changes made to the style
+        """
+        style = OutputFormatterStyle('green')
+        self.assertEqual('\033[32mfoo\033[0m', style.apply('foo'))
+
+        style.set_foreground('red')
+        self.assertEqual('\033[31mfoo\033[0m', style.apply('foo'))
+
+        style.set_background('white')
+        self.assertEqual('\033[31;47mfoo\033[0m', style.apply('foo'))
+
+        style.set_option('bold')
+        style.set_option('bold')
+        self.assertEqual('\033[31;47;1mfoo\033[0m', style.apply('foo'))
+
+        style.set_options(['underscore'])
+        self.assertEqual('\033[31;47;4mfoo\033[0m', style.apply('foo'))
+
+    def test_extended_colors(self):
+        """
+        OutputFormatterStyle supports 256 colors and true colors, downsampled to the terminal colors
+        """
+        try:
+            OutputFormatterStyle.color_depth = Terminal.COLORS_TRUECOLOR
+            self.assertEqual('\033[38;2;255;136;0;48;5;208mfoo\033[0m',
+                             OutputFormatterStyle('#ff8800', '208').apply('foo'))
+            self.assertEqual('\033[38;2;255;136;0mfoo\033[0m', OutputFormatterStyle('#f80').apply('foo'))
+
+            OutputFormatterStyle.color_depth = Terminal.COLORS_256
+            self.assertEqual('\033[38;5;208;48;5;208mfoo\033[0m',
+                             OutputFormatterStyle('#ff8800', '208').apply('foo'))
+            self.assertEqual('\033[38;5;232mfoo\033[0m', OutputFormatterStyle('#080808').apply('foo'))
+
+            OutputFormatterStyle.color_depth = Terminal.COLORS_BASIC
+            self.assertEqual('\033[33;43mfoo\033[0m', OutputFormatterStyle('#ff8800', '208').apply('foo'))
+            self.assertEqual('\033[31mfoo\033[0m', OutputFormatterStyle('9').apply('foo'))
+
+            self.assertRaises(Exception, OutputFormatterStyle, '#ff88')
+            self.assertRaises(Exception, OutputFormatterStyle, '256')
+            self.assertRaises(Exception, OutputFormatterStyle, 'orange')
+        finally:
+            OutputFormatterStyle.color_depth = None
+
+    def test_get_transition(self):
+        """
+        OutputFormatterStyle.get_transition() caches a bounded number of transitions
+        """
+        self.assertEqual('\033[32m', OutputFormatterStyle.get_transition((31, None, (1,)), (32, None, (1,))))
+        self.assertEqual('\033[0m', OutputFormatterStyle.get_transition((31, None, ()), None))
+
+        for i in range(2000):
+            OutputFormatterStyle.get_transition(None, ('38;2;%d;0;0' % (i % 256), '48;2;0;%d;0' % (i // 256), ()))
+
+        info = OutputFormatterStyle.get_transition_cache_info()
+        self.assertEqual(info['max_size'], info['size'])
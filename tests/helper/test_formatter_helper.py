@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+from console.helper.formatter_helper import FormatterHelper
+from console.terminal import Terminal
+
+
+class FormatterHelperTest(TestCase):
+
+    def test_format_section(self):
+        """
+        FormatterHelper.format_section() behaves properly
+        """
+        formatter = FormatterHelper()
+
+        self.assertEqual('<info>[cli]</info> Some text to display',
+                         formatter.format_section('cli', 'Some text to display'))
+
+    def test_format_block(self):
+        """
+        FormatterHelper.format_block() behaves properly
+        """
+        formatter = FormatterHelper()
+
+        self.assertEqual('<error> Some text to display </error>',
+                         formatter.format_block('Some text to display', 'error'))
+        self.assertEqual('<error> Some text to display </error>\n'
+                         '<error> foo bar              </error>',
+                         formatter.format_block(['Some text to display', 'foo bar'], 'error'))
+        self.assertEqual('<error>                        </error>\n'
+                         '<error>  Some text to display  </error>\n'
+                         '<error>                        </error>',
+                         formatter.format_block('Some text to display', 'error', True))
+        self.assertEqual('<error> \\<info>a\\</info> </error>\n'
+                         '<error> 日本語         </error>',
+                         formatter.format_block(['<info>a</info>', '日本語'], 'error'),
+                         msg='.format_block() aligns escaped and wide texts')
+
+        try:
+            Terminal.set_size(12, 24)
+            self.assertEqual('<error> Some text  </error>\n'
+                             '<error> to display </error>',
+                             formatter.format_block('Some text to display', 'error'),
+                             msg='.format_block() wraps messages to the width of the terminal')
+        finally:
+            Terminal.refresh()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+import StringIO
+import time
+
+from unittest import TestCase
+from console.helper.multi_progress_helper import MultiProgressHelper
+from console.helper.progress_helper import ProgressHelper
+from console.helper.progress_counter import ProgressCounter
+from console.output.stream_output import StreamOutput
+
+
+class MultiProgressHelperTest(TestCase):
+
+    def test_refresh(self):
+        """
+        MultiProgressHelper.refresh() redraws all the bars in place
+        """
+        multi = MultiProgressHelper()
+        multi.set_refresh_interval(60)
+        output = StreamOutput(StringIO.StringIO(), decorated=True)
+        multi.start(output)
+
+        first = multi.add(10, self.create_progress(' a %current%/%max%'))
+        second = multi.add(10, self.create_progress(' b %current%/%max%'))
+        first.advance(5)
+        multi.refresh()
+        second.advance()
+        multi.refresh()
+        second.finish()
+        multi.finish()
+
+        output.get_stream().seek(0)
+        self.assertEqual('\033[2K a  5/10\n\033[2K b  0/10'
+                         '\033[1A\r\033[2K a  5/10\n\033[2K b  1/10'
+                         '\033[1A\r\033[2K a  5/10\n\033[2K b  1/10\n',
+                         output.get_stream().read())
+
+    def test_refresher(self):
+        """
+        MultiProgressHelper redraws the bars from a single thread
+        """
+        multi = MultiProgressHelper()
+        multi.set_refresh_interval(0.01)
+        output = StreamOutput(StringIO.StringIO(), decorated=True)
+        multi.start(output)
+
+        progress = multi.add(100, self.create_progress(' %current%/%max%'))
+        for i in range(100):
+            progress.advance()
+
+        time.sleep(0.1)
+        output.get_stream().seek(0)
+        self.assertTrue(output.get_stream().read().endswith('\033[2K 100/100'))
+
+        multi.finish()
+
+    def test_counter(self):
+        """
+        MultiProgressHelper redraws the bars reading from a counter when it changes
+        """
+        multi = MultiProgressHelper()
+        multi.set_refresh_interval(60)
+        output = StreamOutput(StringIO.StringIO(), decorated=True)
+        multi.start(output)
+
+        counter = ProgressCounter()
+        progress = multi.add(10, self.create_progress(' %current%/%max%'))
+        progress.set_counter(counter)
+        multi.refresh()
+
+        self.assertFalse(multi.has_counter_changed())
+        counter.advance(3)
+        self.assertTrue(multi.has_counter_changed())
+
+        multi.refresh()
+        self.assertFalse(multi.has_counter_changed())
+        multi.finish()
+
+        output.get_stream().seek(0)
+        self.assertEqual('\033[2K  0/10\r\033[2K  3/10\r\033[2K  3/10\n', output.get_stream().read())
+
+    def test_undecorated(self):
+        """
+        MultiProgressHelper only draws the bars when finishing on undecorated outputs
+        """
+        multi = MultiProgressHelper()
+        output = StreamOutput(StringIO.StringIO(), decorated=False)
+        multi.start(output)
+
+        first = multi.add(10, self.create_progress(' a %current%/%max%'))
+        second = multi.add(20, self.create_progress(' b %current%/%max%'))
+        first.advance(10)
+        second.advance(3)
+
+        output.get_stream().seek(0)
+        self.assertEqual('', output.get_stream().read())
+
+        multi.finish()
+
+        output.get_stream().seek(0)
+        self.assertEqual(' a 10/10\n b  3/20\n', output.get_stream().read())
+
+    def create_progress(self, display_format):
+        progress = ProgressHelper()
+        progress.set_display_format(display_format)
+        progress.set_redraw_interval(0)
+
+        return progress
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import multiprocessing
+
+from unittest import TestCase
+from console.helper.progress_counter import ProgressCounter, SharedProgressCounter
+
+
+def work(counter, steps):
+    for i in range(steps):
+        counter.advance()
+
+
+class ProgressCounterTest(TestCase):
+
+    def test_advance(self):
+        """
+        ProgressCounter counts the steps of all the threads
+        """
+        counter = ProgressCounter()
+        counter.advance(5)
+        self.assertEqual(5, counter.get_value())
+
+        threads = [threading.Thread(target=work, args=(counter, 10000)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(80005, counter.get_value())
+
+
+class SharedProgressCounterTest(TestCase):
+
+    def test_advance(self):
+        """
+        SharedProgressCounter counts the steps of all the processes
+        """
+        counter = SharedProgressCounter(2)
+        counter.advance(5)
+        self.assertEqual(5, counter.get_value())
+
+        processes = [multiprocessing.Process(target=work, args=(counter, 1000)) for i in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertEqual(4005, counter.get_value(),
+                         msg='processes beyond the number of slots share the last one')
+
+        threads = [threading.Thread(target=work, args=(counter, 1000)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(8005, counter.get_value())
@@ -1,10 +1,25 @@
 # -*- coding: utf-8 -*-
 
 import StringIO
+import math
 
 from unittest import TestCase
+from console.helper import progress_helper
 from console.helper.progress_helper import ProgressHelper
 from console.output.stream_output import StreamOutput
+from console.terminal import Terminal
+
+
+class Clock(object):
+    """
+    Stands for the time module, giving a time set by the test.
+    """
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
 
 
 class ProgressHelperTest(TestCase):
@@ -42,6 +57,7 @@ class ProgressHelperTest(TestCase):
         ProgressHelper.advance() behaves properly when advancing multiple times
         """
         progress = ProgressHelper()
+        progress.set_redraw_interval(0)
         output = self.get_output_stream()
         progress.start(output)
         progress.advance(3)
@@ -76,6 +92,7 @@ class ProgressHelperTest(TestCase):
         Percentage should behave properly for ProgressHelper
         """
         progress = ProgressHelper()
+        progress.set_redraw_interval(0)
         output = self.get_output_stream()
         progress.start(output, 50)
         progress.display()
@@ -88,6 +105,187 @@ class ProgressHelperTest(TestCase):
                          + self.generate_output('  2/50 [=>--------------------------]   4%'),
                          output.get_stream().read())
 
+    def test_redraw_frequency(self):
+        """
+        ProgressHelper only redraws every redraw_freq steps
+        """
+        progress = ProgressHelper()
+        progress.set_redraw_interval(0)
+        progress.set_redraw_frequency(2)
+        output = self.get_output_stream()
+        progress.start(output, 10)
+        for i in range(5):
+            progress.advance()
+
+        output.get_stream().seek(0)
+        self.assertEqual(self.generate_output('  1/10 [==>-------------------------]  10%')
+                         + self.generate_output('  3/10 [========>-------------------]  30%')
+                         + self.generate_output('  5/10 [==============>-------------]  50%'),
+                         output.get_stream().read())
+
+    def test_redraw_interval(self):
+        """
+        ProgressHelper does not redraw more often than the redraw interval
+        and always draws the last step when finishing
+        """
+        progress = ProgressHelper()
+        progress.set_redraw_interval(60)
+        output = self.get_output_stream()
+        progress.start(output, 10)
+        for i in range(10):
+            progress.advance()
+        progress.finish()
+
+        output.get_stream().seek(0)
+        self.assertEqual(self.generate_output('  1/10 [==>-------------------------]  10%')
+                         + self.generate_output(' 10/10 [============================] 100%') + '\n',
+                         output.get_stream().read())
+
+    def test_humane_time(self):
+        """
+        ProgressHelper.humane_time() behaves properly
+        """
+        progress = ProgressHelper()
+
+        self.assertEqual('1 sec', progress.humane_time(1.5))
+        self.assertEqual('5 secs', progress.humane_time(4.2))
+        self.assertEqual('1 min', progress.humane_time(59))
+        self.assertEqual('2 mins', progress.humane_time(90))
+        self.assertEqual('3 days', progress.humane_time(200000))
+        self.assertEqual('', progress.humane_time(10000000))
+
+    def test_nomax(self):
+        """
+        ProgressHelper behaves properly without a maximum number of steps
+        """
+        progress = ProgressHelper()
+        progress.set_bar_width(5)
+        progress.set_redraw_interval(0)
+        progress.set_display_format(' [%bar%]')
+        output = self.get_output_stream()
+        progress.start(output)
+        progress.advance(2)
+        progress.advance(4)
+        progress.finish()
+
+        output.get_stream().seek(0)
+        self.assertEqual(self.generate_output(' [-->--]')
+                         + self.generate_output(' [->---]')
+                         + self.generate_output(' [=====]') + '\n',
+                         output.get_stream().read())
+
+    def test_rate(self):
+        """
+        ProgressHelper smooths the rate with a moving average
+        """
+        progress = ProgressHelper()
+        progress.set_display_format(' %current%/%max% %rate% %remaining% %estimated%')
+        progress.set_rate_window(1)
+        progress.start(self.get_output_stream(), 100)
+        progress.start_time = 0
+
+        progress.current_step = 10
+        progress.update_rate(1.0)
+        self.assertAlmostEqual(10, progress.rate)
+        progress.last_redraw_step, progress.last_redraw_time = 10, 1.0
+
+        weight = 1 - math.exp(-1)
+        progress.current_step = 30
+        progress.update_rate(2.0)
+        self.assertAlmostEqual((weight * 10 + weight * (20 - weight * 10)) / (weight + weight * (1 - weight)),
+                               progress.rate)
+
+        progress.rate = 10.0
+        self.assertEqual(7, progress.get_remaining())
+        self.assertEqual('  10.0/s', progress.format_var('rate'))
+        self.assertEqual('7 secs', progress.format_var('remaining').strip())
+
+    def test_rate_converges(self):
+        """
+        ProgressHelper reports the actual rate, whatever the time of the first redraw
+        """
+        clock = Clock(1000.0)
+        original_time, progress_helper.time = progress_helper.time, clock
+        try:
+            progress = ProgressHelper()
+            progress.set_display_format(' %current%/%max% %rate% %remaining%')
+            progress.start(self.get_output_stream(), 200)
+
+            # the first step is drawn right away
+            clock.now += 0.00001
+            progress.advance()
+            self.assertTrue(progress.rate is None)
+            self.assertEqual('???', progress.format_var('remaining').strip())
+
+            # 20 steps per second
+            for i in range(99):
+                clock.now += 0.05
+                progress.advance()
+
+            self.assertAlmostEqual(20, progress.rate, delta=1)
+            self.assertEqual('5 secs', progress.format_var('remaining').strip())
+        finally:
+            progress_helper.time = original_time
+
+    def test_rate_not_tracked(self):
+        """
+        ProgressHelper only computes the rate when the format needs it
+        """
+        progress = ProgressHelper()
+        progress.set_redraw_interval(0)
+        progress.start(self.get_output_stream(), 10)
+        progress.advance()
+        progress.advance()
+
+        self.assertTrue(progress.rate is None)
+
+    def test_memory(self):
+        """
+        ProgressHelper formats the memory used by the process
+        """
+        progress = ProgressHelper()
+
+        self.assertEqual('512 B', progress.format_memory(512))
+        self.assertEqual('1.5 KiB', progress.format_memory(1536))
+        self.assertEqual('12.0 MiB', progress.format_memory(12 * 1024 * 1024))
+        self.assertEqual('2.0 GiB', progress.format_memory(2 * 1024 * 1024 * 1024))
+        self.assertTrue(progress.get_memory() > 0)
+
+    def test_independent_instances(self):
+        """
+        ProgressHelper instances do not share their state
+        """
+        first = ProgressHelper()
+        second = ProgressHelper()
+        first.set_display_format(' %current%/%max%')
+        second.set_display_format(' %current%')
+        first.start(self.get_output_stream(), 50)
+        second.start(self.get_output_stream())
+
+        self.assertEqual(2, first.widths['current'])
+        self.assertEqual(4, second.widths['current'])
+        self.assertEqual(4, ProgressHelper.widths['current'])
+        self.assertEqual(['current', 'max'], first.format_vars)
+        self.assertEqual(['current'], second.format_vars)
+        self.assertEqual('    0', second.build())
+
+    def test_fit_terminal(self):
+        """
+        ProgressHelper shrinks the bar to fit in the terminal
+        """
+        progress = ProgressHelper()
+        output = StreamOutput(StringIO.StringIO(), decorated=True)
+        try:
+            Terminal.set_size(30, 24)
+            progress.start(output, 50)
+            progress.display()
+        finally:
+            Terminal.refresh()
+
+        output.get_stream().seek(0)
+        self.assertEqual(self.generate_output('  0/50 [>--------------]   0%'),
+                         output.get_stream().read())
+
     def get_output_stream(self):
         stream = StringIO.StringIO()
 
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import subprocess
+
+
+def run_script(script):
+    """
+    Runs a script in a new interpreter and returns its standard output.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    process = subprocess.Popen([sys.executable, '-c', script], cwd=root, stdout=subprocess.PIPE)
+
+    return process.communicate()[0]
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+from console.output.async_stream_output import AsyncStreamOutput
+
+
+class StreamWriter(object):
+
+    def __init__(self):
+        self.buffer = []
+        self.drained = 0
+
+    def write(self, data):
+        self.buffer.append(data)
+
+    def drain(self):
+        self.drained += 1
+
+        return 'drain'
+
+    def get_extra_info(self, name, default=None):
+        return default
+
+
+class AsyncStreamOutputTest(TestCase):
+
+    def test_do_write(self):
+        """
+        AsyncStreamOutput.do_write() writes formatted bytes to the writer without draining
+        """
+        writer = StreamWriter()
+        output = AsyncStreamOutput(writer)
+        self.assertFalse(output.is_decorated())
+
+        output.writeln('<info>foo</info>')
+        output.write(u'bär')
+
+        self.assertEqual(['foo\n', u'bär'.encode('utf-8')], writer.buffer)
+        self.assertEqual(0, writer.drained)
+
+    def test_drain(self):
+        """
+        AsyncStreamOutput.drain() returns the writer's drain awaitable
+        """
+        writer = StreamWriter()
+        output = AsyncStreamOutput(writer)
+
+        self.assertEqual('drain', output.drain())
+        self.assertEqual(1, writer.drained)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+import StringIO
+import threading
+
+from unittest import TestCase
+from console.output.output import OutputError
+from console.output.stream_output import StreamOutput
+from console.output.background_output import BackgroundOutput
+from tests.output import run_script
+
+
+class SlowStream(object):
+
+    def __init__(self):
+        self.chunks = []
+        self.event = threading.Event()
+
+    def write(self, data):
+        self.event.wait()
+        self.chunks.append(data)
+
+    def flush(self):
+        pass
+
+
+class BackgroundOutputTest(TestCase):
+
+    def test_write(self):
+        """
+        BackgroundOutput writes formatted messages from the writer thread
+        """
+        output = BackgroundOutput(StreamOutput(StringIO.StringIO(), decorated=False))
+        for i in range(100):
+            output.writeln('<info>%d</info>' % i)
+        output.flush()
+
+        output.get_output().get_stream().seek(0)
+        self.assertEqual(''.join(['%d\n' % i for i in range(100)]),
+                         output.get_output().get_stream().read())
+
+        output.close()
+        self.assertRaises(OutputError, output.writeln, 'foo')
+
+    def test_overflow(self):
+        """
+        BackgroundOutput applies the overflow policy when the queue is full
+        """
+        stream = SlowStream()
+        output = BackgroundOutput(StreamOutput(stream, decorated=False), 2, BackgroundOutput.OVERFLOW_DROP_OLDEST)
+        for i in range(10):
+            output.write(str(i))
+        stream.event.set()
+        output.close()
+        self.assertTrue(output.dropped > 0)
+        self.assertTrue(''.join(stream.chunks).endswith('89'))
+
+        stream = SlowStream()
+        output = BackgroundOutput(StreamOutput(stream, decorated=False), 2, BackgroundOutput.OVERFLOW_COALESCE)
+        for i in range(10):
+            output.write(str(i))
+        stream.event.set()
+        output.close()
+        self.assertEqual('0123456789', ''.join(stream.chunks))
+
+        stream = SlowStream()
+        stream.event.set()
+        with BackgroundOutput(StreamOutput(stream, decorated=False), 1) as output:
+            for i in range(10):
+                output.write(str(i))
+        self.assertEqual('0123456789', ''.join(stream.chunks))
+
+    def test_close_at_exit(self):
+        """
+        BackgroundOutput writes the queued messages when the interpreter exits
+        """
+        stdout = run_script('''
+import sys, time
+from console.output.stream_output import StreamOutput
+from console.output.background_output import BackgroundOutput
+
+class SlowStream(object):
+    def write(self, data):
+        time.sleep(0.01)
+        sys.stdout.write(data)
+    def flush(self):
+        sys.stdout.flush()
+
+output = BackgroundOutput(StreamOutput(SlowStream(), decorated=False), max_size=1)
+for i in range(20):
+    output.writeln('%d' % i)
+sys.exit(0)
+''')
+        self.assertEqual(''.join(['%d\n' % i for i in range(20)]), stdout)
+
+        stdout = run_script('''
+import sys
+from console.application import Application
+from console.input.list_input import ListInput
+from console.output.stream_output import StreamOutput
+from console.output.background_output import BackgroundOutput
+
+def execute(input_, output_):
+    for i in range(20):
+        output_.writeln('<info>%d</info>' % i)
+
+application = Application()
+application.register('foo').set_code(execute)
+application.run(ListInput([('command', 'foo')]), BackgroundOutput(StreamOutput(sys.stdout, decorated=False)))
+''')
+        self.assertEqual(''.join(['%d\n' % i for i in range(20)]), stdout,
+                         msg='Application.run() flushes its output before exiting')
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+from console.output.buffered_output import BufferedOutput
+
+
+class BufferedOutputTest(TestCase):
+
+    def test_fetch(self):
+        """
+        BufferedOutput.fetch() returns and clears the buffered output
+        """
+        output = BufferedOutput()
+        output.write('<info>foo</info>')
+        output.writeln(['bar', 'baz'])
+
+        self.assertEqual('foobar\nbaz\n', output.fetch())
+        self.assertEqual('', output.fetch())
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import os
+import fcntl
+import threading
+
+from unittest import TestCase
+from console.output.fd_output import FdOutput
+from console.output.buffered_output import BufferedOutput
+from console.output.multiplex_output import MultiplexOutput
+from console.output.thread_safe_output import ThreadSafeOutput
+from tests.output import run_script
+
+
+class CountingFdOutput(FdOutput):
+
+    flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super(CountingFdOutput, self).flush()
+
+
+class FdOutputTest(TestCase):
+
+    def setUp(self):
+        self.read_fd, self.write_fd = os.pipe()
+
+    def tearDown(self):
+        for fd in (self.read_fd, self.write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def test_write(self):
+        """
+        FdOutput writes formatted messages and raw bytes to the file descriptor
+        """
+        output = FdOutput(self.write_fd, decorated=False)
+        output.writeln(['<info>foo</info>', '', 'bar'])
+        output.write_bytes(memoryview(bytearray('bazqux'))[3:])
+
+        self.assertEqual('foo\n\nbar\nqux', os.read(self.read_fd, 1024))
+
+    def test_write_batched(self):
+        """
+        FdOutput writes the messages of a single write together
+        """
+        output = CountingFdOutput(self.write_fd, decorated=False)
+        output.writeln(['a', 'b', 'c', 'd'])
+
+        self.assertEqual(1, output.flushes)
+        self.assertEqual('a\nb\nc\nd\n', os.read(self.read_fd, 1024))
+
+    def test_write_buffered(self):
+        """
+        FdOutput only writes once buffer_size bytes are queued
+        """
+        output = FdOutput(self.write_fd, decorated=False, buffer_size=8)
+        output.writeln('foo')
+        output.writeln('bar')
+        output.writeln('baz')
+
+        self.assertEqual('foo\nbar\nbaz\n', os.read(self.read_fd, 1024))
+
+        output.write('foo')
+        output.flush()
+        self.assertEqual('foo', os.read(self.read_fd, 1024))
+
+        output.write('bar')
+        output.close()
+        self.assertEqual('bar', os.read(self.read_fd, 1024))
+
+    def test_write_wrapped(self):
+        """
+        FdOutput writes the messages given by wrapping outputs
+        """
+        buffered = BufferedOutput()
+        output = MultiplexOutput([FdOutput(self.write_fd, decorated=False), buffered])
+        output.writeln('<info>foo</info>')
+
+        self.assertEqual('foo\n', os.read(self.read_fd, 1024))
+        self.assertEqual('foo\n', buffered.fetch())
+
+        output = ThreadSafeOutput(FdOutput(self.write_fd, decorated=False))
+        output.writeln('bar')
+
+        self.assertEqual('bar\n', os.read(self.read_fd, 1024))
+
+    def test_close_at_exit(self):
+        """
+        FdOutput writes the queued chunks when the interpreter exits
+        """
+        stdout = run_script('''
+import sys
+from console.output.fd_output import FdOutput
+
+output = FdOutput(sys.stdout, decorated=False, buffer_size=65536)
+for i in range(20):
+    output.writeln('%d' % i)
+sys.exit(0)
+''')
+        self.assertEqual(''.join(['%d\n' % i for i in range(20)]), stdout)
+
+    def test_write_non_blocking(self):
+        """
+        FdOutput handles partial writes and EAGAIN on non-blocking file descriptors
+        """
+        flags = fcntl.fcntl(self.write_fd, fcntl.F_GETFL)
+        fcntl.fcntl(self.write_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+        lines = ['%08d' % i for i in range(50000)]
+        received = []
+
+        def read():
+            while True:
+                data = os.read(self.read_fd, 65536)
+                if not data:
+                    break
+
+                received.append(data)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+
+        output = FdOutput(self.write_fd, decorated=False)
+        output.writeln(lines)
+        os.close(self.write_fd)
+        reader.join()
+
+        self.assertEqual('\n'.join(lines) + '\n', ''.join(received))
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import os
+import gzip
+import bz2
+import zlib
+import shutil
+import tempfile
+
+from unittest import TestCase
+from console.output.output import Output
+from console.output.file_output import FileOutput
+from tests.output import run_script
+
+
+class FileOutputTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write(self):
+        """
+        FileOutput writes undecorated and compressed messages
+        """
+        path = os.path.join(self.directory, 'run.log.gz')
+        with FileOutput(path) as output:
+            output.set_decorated(True)
+            output.writeln('<info>foo</info>')
+            output.writeln('bar', verbosity=Output.VERBOSITY_VERBOSE)
+            self.assertFalse(output.is_decorated())
+
+        self.assertEqual('foo\n', gzip.open(path).read())
+
+        path = os.path.join(self.directory, 'run.log')
+        with FileOutput(path, compression=FileOutput.COMPRESSION_BZ2) as output:
+            output.writeln('foo')
+
+        self.assertEqual('foo\n', bz2.BZ2File(path).read())
+
+    def test_rotate(self):
+        """
+        FileOutput rotates files before they grow past max_bytes
+        """
+        path = os.path.join(self.directory, 'run.log.gz')
+        with FileOutput(path, max_bytes=8, backup_count=2) as output:
+            for i in range(4):
+                output.writeln('line %d' % i)
+
+        self.assertEqual('line 1\n', gzip.open(os.path.join(self.directory, 'run.log.2.gz')).read())
+        self.assertEqual('line 2\n', gzip.open(os.path.join(self.directory, 'run.log.1.gz')).read())
+        self.assertEqual('line 3\n', gzip.open(path).read())
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'run.log.3.gz')))
+
+    def test_flush(self):
+        """
+        FileOutput.flush() makes the messages written so far readable
+        """
+        path = os.path.join(self.directory, 'run.log.gz')
+        output = FileOutput(path)
+        output.writeln('foo')
+        output.flush()
+
+        with open(path, 'rb') as f:
+            self.assertEqual('foo\n', zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(f.read()))
+
+        output.close()
+        output.close()
+        self.assertEqual('foo\n', gzip.open(path).read())
+
+    def test_close_at_exit(self):
+        """
+        FileOutput closes the file when the interpreter exits
+        """
+        path = os.path.join(self.directory, 'run.log.gz')
+        run_script('''
+from console.application import Application
+from console.input.list_input import ListInput
+from console.output.file_output import FileOutput
+
+def execute(input_, output_):
+    for i in range(20):
+        output_.writeln('<info>%%d</info>' %% i)
+
+application = Application()
+application.register('foo').set_code(execute)
+application.run(ListInput([('command', 'foo')]), FileOutput(%r))
+''' % path)
+
+        self.assertEqual(''.join(['%d\n' % i for i in range(20)]), gzip.open(path).read())
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+import StringIO
+
+from unittest import TestCase
+from console.output.output import Output
+from console.output.stream_output import StreamOutput
+from console.output.incremental_output import IncrementalOutput
+
+
+class IncrementalOutputTest(TestCase):
+
+    def test_write(self):
+        """
+        IncrementalOutput formats tags spanning several writes
+        """
+        output = IncrementalOutput(StreamOutput(StringIO.StringIO(), decorated=True))
+        output.write('<info>foo')
+        output.write(' bar</in')
+        output.writeln('fo>baz')
+        output.write('<comm')
+        output.write('ent>qux')
+        output.write('<raw>', output_type=Output.OUTPUT_RAW)
+        output.close()
+        output.write('quux')
+
+        output.get_output().get_stream().seek(0)
+        self.assertEqual('\033[32mfoo\033[0m\033[32m bar\033[0mbaz\n\033[33mqux\033[0m<raw>quux',
+                         output.get_output().get_stream().read())
+
+    def test_verbosity(self):
+        """
+        IncrementalOutput skips the messages that are too verbose
+        """
+        output = IncrementalOutput(StreamOutput(StringIO.StringIO(), decorated=False))
+        output.write('<info>foo')
+        output.write('bar', verbosity=Output.VERBOSITY_VERBOSE)
+        output.write('baz</info>')
+
+        output.get_output().get_stream().seek(0)
+        self.assertEqual('foobaz', output.get_output().get_stream().read())
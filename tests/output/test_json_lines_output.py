@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import StringIO
+import json
+
+from unittest import TestCase
+from console.output.output import Output
+from console.output.json_lines_output import JsonLinesOutput
+from tests.output import run_script
+
+
+class JsonLinesOutputTest(TestCase):
+
+    def test_write_record(self):
+        """
+        JsonLinesOutput.write_record() writes records in batches
+        """
+        output = JsonLinesOutput(StringIO.StringIO(), batch_size=2)
+        output.write_record({'foo': 1})
+        self.assertEqual('', output.get_stream().getvalue())
+
+        output.write_record({'foo': '<info>bar</info>'})
+        output.write_record({'foo': 3}, Output.VERBOSITY_VERBOSE)
+        self.assertEqual([{'foo': 1}, {'foo': '<info>bar</info>'}],
+                         map(json.loads, output.get_stream().getvalue().splitlines()))
+
+        output.write_records([{'foo': 4}, {'foo': 5}, {'foo': 6}])
+        output.flush()
+        self.assertEqual([{'foo': 1}, {'foo': '<info>bar</info>'}, {'foo': 4}, {'foo': 5}, {'foo': 6}],
+                         map(json.loads, output.get_stream().getvalue().splitlines()))
+
+    def test_writeln(self):
+        """
+        JsonLinesOutput.writeln() writes undecorated message records
+        """
+        output = JsonLinesOutput(StringIO.StringIO())
+        output.set_decorated(True)
+        output.writeln('<info>foo</info>')
+        output.flush()
+
+        self.assertEqual([{'message': 'foo'}], map(json.loads, output.get_stream().getvalue().splitlines()))
+
+    def test_close(self):
+        """
+        JsonLinesOutput writes the buffered records when closed
+        """
+        stream = StringIO.StringIO()
+        with JsonLinesOutput(stream) as output:
+            output.write_record({'foo': 1})
+            self.assertEqual('', stream.getvalue())
+
+        self.assertEqual([{'foo': 1}], map(json.loads, stream.getvalue().splitlines()))
+        self.assertFalse(stream.closed)
+
+    def test_close_at_exit(self):
+        """
+        JsonLinesOutput writes the buffered records when the interpreter exits
+        """
+        stdout = run_script('''
+import sys
+from console.application import Application
+from console.input.list_input import ListInput
+from console.output.json_lines_output import JsonLinesOutput
+
+def execute(input_, output_):
+    output_.write_record({'foo': 1})
+    output_.write_record({'foo': 2})
+
+application = Application()
+application.register('foo').set_code(execute)
+application.run(ListInput([('command', 'foo')]), JsonLinesOutput(sys.stdout))
+''')
+        self.assertEqual([{'foo': 1}, {'foo': 2}], map(json.loads, stdout.splitlines()))
+
+        stdout = run_script('''
+import sys
+from console.output.json_lines_output import JsonLinesOutput
+
+JsonLinesOutput(sys.stdout).write_record({'foo': 1})
+sys.exit(0)
+''')
+        self.assertEqual([{'foo': 1}], map(json.loads, stdout.splitlines()))
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+from console.output.output import Output
+from console.output.buffered_output import BufferedOutput
+from console.output.multiplex_output import MultiplexOutput
+
+
+class MultiplexOutputTest(TestCase):
+
+    def test_write(self):
+        """
+        MultiplexOutput.write() renders messages for each output's decoration and verbosity
+        """
+        console = BufferedOutput(Output.VERBOSITY_NORMAL, True)
+        log = BufferedOutput(Output.VERBOSITY_DEBUG, False)
+        output = MultiplexOutput([console, log])
+        self.assertEqual(Output.VERBOSITY_DEBUG, output.get_verbosity())
+
+        output.writeln('<info>foo</info>')
+        output.writeln('bar', verbosity=Output.VERBOSITY_DEBUG)
+
+        self.assertEqual('\033[32mfoo\033[0m\n', console.fetch())
+        self.assertEqual('foo\nbar\n', log.fetch())
+
+        output.set_verbosity(Output.VERBOSITY_QUIET)
+        output.writeln('foo')
+        self.assertEqual('', console.fetch())
+        self.assertEqual('', log.fetch())
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+from console.output.output import Output
+from console.output.null_output import NullOutput
+
+
+class NullOutputTest(TestCase):
+
+    def test_write(self):
+        """
+        NullOutput.write() discards messages without evaluating them
+        """
+        output = NullOutput()
+        output.set_verbosity(Output.VERBOSITY_DEBUG)
+        output.set_decorated(True)
+
+        def message():
+            raise AssertionError('The message should not be evaluated')
+
+        output.writeln(message)
+        output.write(message, verbosity=Output.VERBOSITY_QUIET)
+
+        self.assertEqual(Output.VERBOSITY_QUIET, output.get_verbosity())
+        self.assertTrue(output.is_quiet())
+        self.assertFalse(output.is_decorated())
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import StringIO
+
+from unittest import TestCase
+from console.output.output import Output
+from console.output.stream_output import StreamOutput
+
+
+class OutputTest(TestCase):
+
+    def test_write_with_verbosity(self):
+        """
+        Output.write() only writes messages allowed by the current verbosity
+        """
+        output = self.get_output_stream(Output.VERBOSITY_VERBOSE)
+        output.writeln('normal')
+        output.writeln('verbose', verbosity=Output.VERBOSITY_VERBOSE)
+        output.writeln('very verbose', verbosity=Output.VERBOSITY_VERY_VERBOSE)
+        output.writeln('debug', verbosity=Output.VERBOSITY_DEBUG)
+
+        output.get_stream().seek(0)
+        self.assertEqual('normal\nverbose\n', output.get_stream().read())
+
+        output = self.get_output_stream(Output.VERBOSITY_QUIET)
+        output.writeln('normal')
+
+        output.get_stream().seek(0)
+        self.assertEqual('', output.get_stream().read())
+
+    def test_write_callable(self):
+        """
+        Output.write() only evaluates callable messages when they are displayed
+        """
+        calls = []
+
+        def message():
+            calls.append(True)
+
+            return 'debug'
+
+        output = self.get_output_stream(Output.VERBOSITY_VERBOSE)
+        output.writeln(message, verbosity=Output.VERBOSITY_DEBUG)
+        self.assertEqual([], calls)
+
+        output.set_verbosity(Output.VERBOSITY_DEBUG)
+        output.writeln(message, verbosity=Output.VERBOSITY_DEBUG)
+        output.writeln(['foo', message], verbosity=Output.VERBOSITY_DEBUG)
+        self.assertEqual(2, len(calls))
+
+        output.get_stream().seek(0)
+        self.assertEqual('debug\nfoo\ndebug\n', output.get_stream().read())
+
+    def test_verbosity_predicates(self):
+        """
+        Output.is_quiet(), is_verbose(), is_very_verbose() and is_debug() behave properly
+        """
+        output = self.get_output_stream(Output.VERBOSITY_VERY_VERBOSE)
+        self.assertFalse(output.is_quiet())
+        self.assertTrue(output.is_verbose())
+        self.assertTrue(output.is_very_verbose())
+        self.assertFalse(output.is_debug())
+
+        output.set_verbosity(Output.VERBOSITY_QUIET)
+        self.assertTrue(output.is_quiet())
+        self.assertFalse(output.is_verbose())
+
+    def test_write_plain(self):
+        """
+        Output.write() strips style tags from plain messages, even when decorated
+        """
+        output = StreamOutput(StringIO.StringIO(), Output.VERBOSITY_NORMAL, True)
+        output.writeln('<info>foo</info> \\<bar>', Output.OUTPUT_PLAIN)
+
+        output.get_stream().seek(0)
+        self.assertEqual('foo <bar>\n', output.get_stream().read())
+
+    def get_output_stream(self, verbosity):
+        return StreamOutput(StringIO.StringIO(), verbosity, False)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+import StringIO
+import threading
+
+from unittest import TestCase
+from console.output.stream_output import StreamOutput
+from console.output.thread_safe_output import ThreadSafeOutput
+
+
+class ThreadSafeOutputTest(TestCase):
+
+    def test_concurrent_writes(self):
+        """
+        ThreadSafeOutput writes whole lines when used from many threads
+        """
+        output = ThreadSafeOutput(StreamOutput(StringIO.StringIO(), decorated=True))
+
+        def work(worker):
+            for i in range(200):
+                output.write('<info>worker %d ' % worker)
+                output.write('<comment>line %d</comment>' % i)
+                output.writeln('</info>')
+
+        threads = [threading.Thread(target=work, args=(worker,)) for worker in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        output.get_output().get_stream().seek(0)
+        lines = output.get_output().get_stream().read().splitlines()
+        self.assertEqual(16 * 200, len(lines))
+
+        for worker in range(16):
+            expected = ['\033[32mworker %d \033[0m\033[33mline %d\033[0m' % (worker, i)
+                        for i in range(200)]
+            self.assertEqual(expected, [line for line in lines if line.startswith('\033[32mworker %d ' % worker)])
+
+    def test_flush(self):
+        """
+        ThreadSafeOutput.flush() writes the pending incomplete line
+        """
+        output = ThreadSafeOutput(StreamOutput(StringIO.StringIO(), decorated=False))
+        output.write('foo')
+        output.write('bar\nbaz')
+
+        output.get_output().get_stream().seek(0)
+        self.assertEqual('foobar\n', output.get_output().get_stream().read())
+
+        output.flush()
+        output.get_output().get_stream().seek(0)
+        self.assertEqual('foobar\nbaz', output.get_output().get_stream().read())
+
+    def test_flush_current_thread(self):
+        """
+        ThreadSafeOutput.flush() only writes the incomplete line of the calling thread
+        """
+        stream = StringIO.StringIO()
+        output = ThreadSafeOutput(StreamOutput(stream, decorated=False))
+        started, stop = threading.Event(), threading.Event()
+
+        def work():
+            output.write('foo')
+            started.set()
+            stop.wait()
+            output.writeln('bar')
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        started.wait()
+
+        output.write('Continue? ')
+        output.flush()
+        self.assertEqual('Continue? ', stream.getvalue(),
+                         msg='.flush() does not write the half-written lines of other threads')
+
+        stop.set()
+        thread.join()
+        self.assertEqual('Continue? foobar\n', stream.getvalue())
+
+    def test_carriage_return(self):
+        """
+        ThreadSafeOutput writes the messages redrawing a line right away
+        """
+        stream = StringIO.StringIO()
+        output = ThreadSafeOutput(StreamOutput(stream, decorated=False))
+        output.write('foo')
+        output.write('\rbar')
+
+        self.assertEqual('foo\rbar', stream.getvalue())
+
+    def test_close(self):
+        """
+        ThreadSafeOutput writes the incomplete lines of the exited threads and, when closed, of all the threads
+        """
+        stream = StringIO.StringIO()
+        output = ThreadSafeOutput(StreamOutput(stream, decorated=False))
+
+        thread = threading.Thread(target=output.write, args=('foo',))
+        thread.start()
+        thread.join()
+
+        thread = threading.Thread(target=output.writeln, args=('bar',))
+        thread.start()
+        thread.join()
+        self.assertEqual('foobar\n', stream.getvalue(),
+                         msg='the incomplete line of an exited thread is written when a new thread writes')
+
+        started, stop = threading.Event(), threading.Event()
+
+        def work():
+            output.write('baz')
+            started.set()
+            stop.wait()
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        started.wait()
+
+        output.close()
+        stop.set()
+        thread.join()
+        self.assertEqual('foobar\nbaz', stream.getvalue(),
+                         msg='.close() writes the incomplete line of a running thread')
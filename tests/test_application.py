@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import StringIO
+
+from unittest import TestCase
+from console.application import Application
+from console.input.argv_input import ArgvInput
+from console.output.output import Output
+from console.output.stream_output import StreamOutput
+
+
+class ApplicationTest(TestCase):
+
+    def test_run_verbosity(self):
+        """
+        Application.run() sets the output verbosity from the verbosity options
+        """
+        application = Application()
+        application.set_auto_exit(False)
+        application.register('foo').set_code(lambda input_, output_: 0)
+
+        argv = sys.argv
+        for option, verbosity in [('-v', Output.VERBOSITY_VERBOSE),
+                                  ('--verbose', Output.VERBOSITY_VERBOSE),
+                                  ('-vv', Output.VERBOSITY_VERY_VERBOSE),
+                                  ('--verbose=2', Output.VERBOSITY_VERY_VERBOSE),
+                                  ('-vvv', Output.VERBOSITY_DEBUG),
+                                  ('--verbose=3', Output.VERBOSITY_DEBUG)]:
+            sys.argv = ['cli.py', 'foo', option]
+            output = StreamOutput(StringIO.StringIO())
+            self.assertEqual(0, application.run(ArgvInput(), output))
+            self.assertEqual(verbosity, output.get_verbosity())
+
+        sys.argv = argv
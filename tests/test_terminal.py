@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import signal
+import threading
+import tempfile
+import StringIO
+
+from unittest import TestCase
+from console.terminal import Terminal
+
+
+class TerminalTest(TestCase):
+
+    def test_detect_color_depth(self):
+        """
+        Terminal.detect_color_depth() detects the colors from the environment
+        """
+        self.assertEqual(Terminal.COLORS_TRUECOLOR,
+                         Terminal.detect_color_depth({'COLORTERM': 'truecolor', 'TERM': 'xterm'}))
+        self.assertEqual(Terminal.COLORS_TRUECOLOR, Terminal.detect_color_depth({'TERM': 'xterm-direct'}))
+        self.assertEqual(Terminal.COLORS_256, Terminal.detect_color_depth({'TERM': 'screen-256color'}))
+        self.assertEqual(Terminal.COLORS_BASIC, Terminal.detect_color_depth({'TERM': 'dumb'}))
+        self.assertEqual(Terminal.COLORS_BASIC, Terminal.detect_color_depth({}))
+
+    def test_detect_size(self):
+        """
+        Terminal.detect_size() uses the COLUMNS and LINES environment variables
+        """
+        self.assertEqual((120, 40), Terminal.detect_size({'COLUMNS': '120', 'LINES': '40'}))
+
+        columns, rows = Terminal.detect_size({'COLUMNS': 'foo'})
+        self.assertTrue(columns > 0 and rows > 0)
+
+    def test_get_size(self):
+        """
+        Terminal.get_size() caches the size until the terminal is resized
+        """
+        try:
+            Terminal.get_size()
+            Terminal.set_size(100, 30)
+            self.assertEqual((100, 30), Terminal.get_size())
+            self.assertEqual(100, Terminal.get_columns())
+            self.assertEqual(30, Terminal.get_rows())
+
+            if hasattr(signal, 'SIGWINCH') and signal.getsignal(signal.SIGWINCH) not in (None, signal.SIG_DFL):
+                os.kill(os.getpid(), signal.SIGWINCH)
+                self.assertEqual(Terminal.detect_size(), Terminal.get_size(),
+                                 msg='.get_size() detects the size again after a SIGWINCH')
+        finally:
+            Terminal.refresh()
+
+    def test_winch_handler_restarts_system_calls(self):
+        """
+        Terminal.install_winch_handler() does not make blocking system calls fail
+        """
+        if not hasattr(signal, 'SIGWINCH'):
+            return
+
+        Terminal.install_winch_handler()
+        if signal.getsignal(signal.SIGWINCH) in (None, signal.SIG_DFL):
+            return
+
+        read_fd, write_fd = os.pipe()
+
+        def resize():
+            time.sleep(0.05)
+            os.kill(os.getpid(), signal.SIGWINCH)
+            time.sleep(0.05)
+            os.write(write_fd, 'x')
+
+        thread = threading.Thread(target=resize)
+        thread.start()
+        try:
+            self.assertEqual('x', os.read(read_fd, 1))
+        finally:
+            thread.join()
+            os.close(read_fd)
+            os.close(write_fd)
+            Terminal.refresh()
+
+    def test_is_tty(self):
+        """
+        Terminal.is_tty() tells terminals from other streams
+        """
+        self.assertFalse(Terminal.is_tty(StringIO.StringIO()))
+        self.assertFalse(Terminal.has_color_support(StringIO.StringIO()))
+
+        with tempfile.TemporaryFile() as f:
+            self.assertFalse(Terminal.is_tty(f))
+            self.assertFalse(Terminal.is_tty(f.fileno()))
+
+        self.assertEqual(os.isatty(1), Terminal.is_tty(1))
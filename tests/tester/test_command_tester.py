@@ -46,8 +46,7 @@ class TestCommandTester(TestCase):
         """
         CommandTester.get_input() behaves properly
         """
-        self.tester.get_output().get_stream().seek(0)
-        self.assertEqual('foo\n', self.tester.get_output().get_stream().read(),
+        self.assertEqual('foo\n', self.tester.get_output().fetch(),
                          msg='.get_output() returns the current output instance.')
 
     def test_get_display(self):